@@ -3,15 +3,30 @@ Financial advice endpoint.
 Generates personalized financial advice based on user data.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, Optional
+import random
 
-from app.core.agent import agent
+from app.core.agent import FinancialAIAgent, get_agent, to_sse
 
 
 router = APIRouter()
 
+TIPS = (
+    "💡 Save at least 20% of your income if possible.",
+    "💡 Pay yourself first - set up automatic savings transfers.",
+    "💡 Review subscriptions monthly and cancel unused ones.",
+    "💡 Use the 24-hour rule before making non-essential purchases.",
+    "💡 Build an emergency fund with 3-6 months of expenses.",
+    "💡 Pay more than the minimum on credit cards when possible.",
+    "💡 Track every expense for one month to understand your spending.",
+    "💡 Set specific, measurable financial goals.",
+    "💡 Review your budget at the end of each month.",
+    "💡 Look for ways to increase income, not just cut expenses."
+)
+
 
 class AdviceRequest(BaseModel):
     """Request model for financial advice."""
@@ -27,13 +42,16 @@ class AdviceResponse(BaseModel):
 
 
 @router.post("/advice", response_model=AdviceResponse)
-async def get_financial_advice(request: AdviceRequest):
+async def get_financial_advice(
+    request: AdviceRequest,
+    agent: FinancialAIAgent = Depends(get_agent)
+):
     """
     Get personalized financial advice based on user's financial data.
     
     Uses AI when available, falls back to rule-based advice otherwise.
     """
-    advice = agent.get_advice(request.financial_data)
+    advice = await agent.get_advice(request.financial_data)
     
     return AdviceResponse(
         user_id=request.user_id,
@@ -42,21 +60,26 @@ async def get_financial_advice(request: AdviceRequest):
     )
 
 
+@router.post("/advice/stream")
+async def stream_financial_advice(
+    request: AdviceRequest,
+    agent: FinancialAIAgent = Depends(get_agent)
+):
+    """
+    Stream personalized financial advice as Server-Sent Events.
+    
+    Each event carries the next chunk of advice text as soon as it is
+    generated, followed by a final ``done`` event.
+    """
+    async def events():
+        async for token in agent.stream_advice(request.financial_data):
+            yield to_sse(token)
+        yield to_sse("[DONE]", event="done")
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @router.post("/advice/quick")
 async def get_quick_tip():
     """Get a random quick financial tip."""
-    tips = [
-        "💡 Save at least 20% of your income if possible.",
-        "💡 Pay yourself first - set up automatic savings transfers.",
-        "💡 Review subscriptions monthly and cancel unused ones.",
-        "💡 Use the 24-hour rule before making non-essential purchases.",
-        "💡 Build an emergency fund with 3-6 months of expenses.",
-        "💡 Pay more than the minimum on credit cards when possible.",
-        "💡 Track every expense for one month to understand your spending.",
-        "💡 Set specific, measurable financial goals.",
-        "💡 Review your budget at the end of each month.",
-        "💡 Look for ways to increase income, not just cut expenses."
-    ]
-    
-    import random
-    return {"tip": random.choice(tips)}
+    return {"tip": random.choice(TIPS)}
@@ -3,11 +3,13 @@ Chat endpoint.
 Handles conversational AI interactions with users.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, Optional, List
+import json
 
-from app.core.agent import agent
+from app.core.agent import FinancialAIAgent, get_agent, keyword_pattern, match_topic, to_sse
 
 
 router = APIRouter()
@@ -35,14 +37,17 @@ class ChatResponse(BaseModel):
 
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat_with_agent(request: ChatRequest):
+async def chat_with_agent(
+    request: ChatRequest,
+    agent: FinancialAIAgent = Depends(get_agent)
+):
     """
     Chat with the financial AI assistant.
     
     Provides conversational support for financial questions
     with context-aware responses.
     """
-    response = agent.chat(request.message, request.context)
+    response = await agent.chat(request.message, request.context)
     
     # Generate follow-up suggestions based on the conversation
     suggestions = generate_suggestions(request.message)
@@ -54,74 +59,104 @@ async def chat_with_agent(request: ChatRequest):
     )
 
 
-def generate_suggestions(message: str) -> List[str]:
-    """Generate follow-up question suggestions based on the user's message."""
-    message_lower = message.lower()
-    
-    if any(word in message_lower for word in ["save", "saving"]):
-        return [
-            "How do I create an emergency fund?",
-            "What's the best way to save for retirement?",
-            "How can I save money on groceries?"
-        ]
-    
-    if any(word in message_lower for word in ["budget", "spending"]):
-        return [
-            "What budgeting method should I use?",
-            "How can I track my expenses better?",
-            "What are common budget mistakes?"
-        ]
-    
-    if any(word in message_lower for word in ["invest", "stock"]):
-        return [
-            "How do I start investing with little money?",
-            "What are index funds?",
-            "Should I pay off debt or invest?"
-        ]
+@router.post("/chat/stream")
+async def stream_chat_with_agent(
+    request: ChatRequest,
+    agent: FinancialAIAgent = Depends(get_agent)
+):
+    """
+    Stream the assistant's reply as Server-Sent Events.
     
-    if any(word in message_lower for word in ["debt", "loan", "credit"]):
-        return [
-            "How do I pay off debt faster?",
-            "What's the debt avalanche method?",
-            "How can I improve my credit score?"
-        ]
+    Response chunks are sent as they are generated; the follow-up
+    suggestions arrive last as a JSON-encoded ``suggestions`` event.
+    """
+    async def events():
+        async for token in agent.stream_chat(request.message, request.context):
+            yield to_sse(token)
+        yield to_sse(json.dumps(generate_suggestions(request.message)), event="suggestions")
     
-    # Default suggestions
-    return [
-        "How can I save more money?",
-        "Help me create a budget",
-        "What's a good savings rate?"
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+# Keyword -> suggestion topic; keywords match anywhere in the message
+SUGGESTION_KEYWORDS: Dict[str, str] = {
+    **dict.fromkeys(("save", "saving"), "save"),
+    **dict.fromkeys(("budget", "spending"), "budget"),
+    **dict.fromkeys(("invest", "stock"), "invest"),
+    **dict.fromkeys(("debt", "loan", "credit"), "debt"),
+}
+SUGGESTION_PATTERN = keyword_pattern(SUGGESTION_KEYWORDS)
+
+# When a message touches several topics, the first one listed wins
+SUGGESTION_PRIORITY = ("save", "budget", "invest", "debt")
+
+SUGGESTIONS: Dict[str, tuple] = {
+    "save": (
+        "How do I create an emergency fund?",
+        "What's the best way to save for retirement?",
+        "How can I save money on groceries?"
+    ),
+    "budget": (
+        "What budgeting method should I use?",
+        "How can I track my expenses better?",
+        "What are common budget mistakes?"
+    ),
+    "invest": (
+        "How do I start investing with little money?",
+        "What are index funds?",
+        "Should I pay off debt or invest?"
+    ),
+    "debt": (
+        "How do I pay off debt faster?",
+        "What's the debt avalanche method?",
+        "How can I improve my credit score?"
+    ),
+}
+
+DEFAULT_SUGGESTIONS = (
+    "How can I save more money?",
+    "Help me create a budget",
+    "What's a good savings rate?"
+)
+
+
+def generate_suggestions(message: str) -> List[str]:
+    """Generate follow-up question suggestions based on the user's message."""
+    topic = match_topic(message, SUGGESTION_KEYWORDS, SUGGESTION_PATTERN, SUGGESTION_PRIORITY)
+    return list(SUGGESTIONS.get(topic, DEFAULT_SUGGESTIONS))
+
+
+STARTERS = {
+    "starters": [
+        {
+            "title": "💰 Savings Help",
+            "prompt": "How can I save more money each month?"
+        },
+        {
+            "title": "📊 Budget Review",
+            "prompt": "Can you help me understand my spending habits?"
+        },
+        {
+            "title": "🎯 Financial Goals",
+            "prompt": "How do I set realistic financial goals?"
+        },
+        {
+            "title": "📈 Investment Basics",
+            "prompt": "What should I know about starting to invest?"
+        },
+        {
+            "title": "💳 Debt Management",
+            "prompt": "What's the best way to pay off my debt?"
+        },
+        {
+            "title": "🏦 Emergency Fund",
+            "prompt": "How much should I have in an emergency fund?"
+        }
     ]
+}
 
 
 @router.get("/chat/starters")
 async def get_conversation_starters():
     """Get suggested conversation starters for new users."""
-    return {
-        "starters": [
-            {
-                "title": "💰 Savings Help",
-                "prompt": "How can I save more money each month?"
-            },
-            {
-                "title": "📊 Budget Review",
-                "prompt": "Can you help me understand my spending habits?"
-            },
-            {
-                "title": "🎯 Financial Goals",
-                "prompt": "How do I set realistic financial goals?"
-            },
-            {
-                "title": "📈 Investment Basics",
-                "prompt": "What should I know about starting to invest?"
-            },
-            {
-                "title": "💳 Debt Management",
-                "prompt": "What's the best way to pay off my debt?"
-            },
-            {
-                "title": "🏦 Emergency Fund",
-                "prompt": "How much should I have in an emergency fund?"
-            }
-        ]
-    }
+    return STARTERS
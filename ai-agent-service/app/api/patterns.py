@@ -3,15 +3,68 @@ Spending patterns analysis endpoint.
 Analyzes transaction patterns and provides insights.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import ValidationError
 from pydantic import BaseModel
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 from datetime import datetime
-from collections import defaultdict
+import re
+
+import numpy as np
+import orjson
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    # Python 3.11+ fromisoformat accepts the trailing "Z" natively
+    _parse_iso = datetime.fromisoformat
+
+from app.core.batcher import MicroBatcher
+from app.core.config import settings
 
 
 router = APIRouter()
 
+SUBSCRIPTION_KEYWORDS = ("netflix", "spotify", "hulu", "subscription", "monthly", "membership")
+
+
+def _build_subscription_matcher():
+    """
+    Compile the subscription keywords into a single-pass matcher.
+    
+    Uses an Aho-Corasick automaton when pyahocorasick is installed,
+    otherwise one compiled regex alternation.
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword in SUBSCRIPTION_KEYWORDS:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    
+    pattern = re.compile("|".join(re.escape(keyword) for keyword in SUBSCRIPTION_KEYWORDS))
+    return lambda text: pattern.search(text) is not None
+
+
+_is_subscription = _build_subscription_matcher()
+
 
 class Transaction(BaseModel):
     """Transaction model for pattern analysis."""
@@ -47,6 +100,116 @@ class PatternsResponse(BaseModel):
     areas_for_improvement: List[str]
 
 
+if msgspec is not None:
+    class TransactionStruct(msgspec.Struct):
+        """Transaction decoded straight from JSON, mirroring ``Transaction``."""
+        id: int
+        description: str
+        amount: float
+        type: str
+        date: str
+        category: Optional[str] = None
+
+    class PatternsRequestStruct(msgspec.Struct):
+        """Request body decoded straight from JSON, mirroring ``PatternsRequest``."""
+        user_id: int
+        transactions: List[TransactionStruct]
+
+    # strict=False keeps Pydantic's lax coercions such as "12.50" -> 12.5
+    DECODER = msgspec.json.Decoder(PatternsRequestStruct, strict=False)
+else:
+    DECODER = None
+
+
+def request_body_schema(model: type) -> Dict[str, Any]:
+    """
+    Build an ``openapi_extra`` request body for routes that parse JSON themselves.
+    
+    Nested ``$defs`` references are inlined so the schema is self-contained.
+    
+    Args:
+        model: Pydantic model describing the request body
+        
+    Returns:
+        Dict suitable for the ``openapi_extra`` route argument
+    """
+    schema = model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+    
+    def resolve(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(definitions[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+    
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": resolve(schema)}}
+        }
+    }
+
+
+# The routes decode the raw body themselves, so document it explicitly
+PATTERNS_REQUEST_BODY = request_body_schema(PatternsRequest)
+
+
+async def _decode_request(request: Request):
+    """
+    Decode a pattern analysis request body.
+    
+    Uses msgspec when available, which decodes JSON directly into
+    lightweight structs instead of running Pydantic validators per row;
+    the transactions are repacked into NumPy arrays right away anyway.
+    Bodies msgspec rejects go through Pydantic, which reports the usual
+    per-field errors.
+    
+    Args:
+        request: Incoming HTTP request
+        
+    Returns:
+        Object with ``user_id`` and ``transactions`` attributes
+        
+    Raises:
+        RequestValidationError: If the body is malformed or fails validation
+    """
+    body = await request.body()
+    if DECODER is not None:
+        try:
+            return DECODER.decode(body)
+        except msgspec.DecodeError:
+            pass
+    
+    try:
+        return PatternsRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)
+        ])
+
+
+def _parse_date(date_str: str) -> datetime:
+    """Parse an ISO date string, falling back to now for malformed values."""
+    try:
+        return _parse_iso(date_str)
+    except ValueError:
+        return datetime.now()
+
+
+def _get_empty_result() -> dict:
+    """Return the analysis result for a user without transactions."""
+    return {
+        "patterns": [],
+        "spending_personality": "Unknown",
+        "risk_score": 5,
+        "strengths": [],
+        "areas_for_improvement": ["Add transactions to analyze your spending patterns"]
+    }
+
+
 def analyze_patterns(transactions: List[Transaction]) -> dict:
     """
     Analyze transaction patterns to identify spending behaviors.
@@ -57,132 +220,317 @@ def analyze_patterns(transactions: List[Transaction]) -> dict:
     Returns:
         Dictionary containing pattern analysis results
     """
-    if not transactions:
-        return {
-            "patterns": [],
-            "spending_personality": "Unknown",
-            "risk_score": 5,
-            "strengths": [],
-            "areas_for_improvement": ["Add transactions to analyze your spending patterns"]
-        }
+    return analyze_patterns_batch([transactions])[0]
+
+
+def analyze_patterns_batch(batch: List[List[Transaction]]) -> List[dict]:
+    """
+    Analyze several users' transactions in one vectorized pass.
     
-    patterns = []
-    strengths = []
-    improvements = []
+    Args:
+        batch: One list of transactions per user
+        
+    Returns:
+        One pattern analysis result per input list, in the same order
+    """
+    return [
+        _build_result(stats) if stats is not None else _get_empty_result()
+        for stats in user_stats_batch(batch)
+    ]
+
+
+def user_stats_batch(batch: List[List[Transaction]]) -> List[Optional[dict]]:
+    """
+    Compute per-user aggregates for several users at once.
     
-    # Parse transactions
-    expense_transactions = []
-    income_transactions = []
+    All transactions are concatenated into flat arrays with one segment
+    per user, so every aggregate is a single segmented NumPy reduction
+    no matter how many users are in the batch.
     
-    for t in transactions:
-        try:
-            date = datetime.fromisoformat(t.date.replace('Z', '+00:00'))
-        except:
-            date = datetime.now()
+    Args:
+        batch: One list of transactions per user
         
-        tx_data = {
-            "amount": float(t.amount),
-            "category": t.category or "Uncategorized",
-            "description": t.description.lower(),
-            "date": date,
-            "day_of_week": date.weekday(),
-            "hour": date.hour
-        }
+    Returns:
+        One aggregates dict per input list, or None for users without transactions
+    """
+    results = [None] * len(batch)
+    active = [i for i, transactions in enumerate(batch) if transactions]
+    if not active:
+        return results
+    
+    stats = _segment_stats([batch[i] for i in active])
+    for row, i in enumerate(active):
+        results[i] = {key: value[row] for key, value in stats.items()}
+    return results
+
+
+def _segment_stats(batch: List[List[Transaction]]) -> Dict[str, list]:
+    """Compute per-user aggregates over concatenated transaction arrays."""
+    transactions = [t for user_transactions in batch for t in user_transactions]
+    lengths = np.fromiter((len(u) for u in batch), dtype=np.int64, count=len(batch))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    
+    # Parse transactions once into parallel arrays
+    n = len(transactions)
+    amounts = np.fromiter((float(t.amount) for t in transactions), dtype=np.float64, count=n)
+    day_of_week = np.fromiter((_parse_date(t.date).weekday() for t in transactions), dtype=np.int8, count=n)
+    is_expense = np.fromiter((t.type == "EXPENSE" for t in transactions), dtype=bool, count=n)
+    is_subscription = is_expense & np.fromiter(
+        (_is_subscription(t.description.lower()) for t in transactions), dtype=bool, count=n
+    )
+    categories = np.array([t.category or "Uncategorized" for t in transactions], dtype=object)
+    category_names, category_idx = np.unique(categories, return_inverse=True)
+    
+    reduce = _reduce_segments_jit if _reduce_segments_jit is not None else _reduce_segments_numpy
+    stats, category_totals, first_seen = reduce(
+        amounts, day_of_week, is_expense, is_subscription,
+        category_idx.astype(np.int64), starts, lengths, category_names.size
+    )
+    
+    stats["category_names"] = []
+    stats["category_totals"] = []
+    for u in range(len(batch)):
+        # Keep categories in the order they first appear
+        order = np.argsort(first_seen[u], kind="stable")
+        order = order[first_seen[u, order] < n]
+        stats["category_names"].append(category_names[order])
+        stats["category_totals"].append(category_totals[u, order])
+    return stats
+
+
+def _reduce_segments_numpy(amounts, day_of_week, is_expense, is_subscription,
+                           category_idx, starts, lengths, n_categories):
+    """Segmented reductions with NumPy ufuncs, one pass per aggregate."""
+    n = amounts.size
+    n_users = starts.size
+    user_idx = np.repeat(np.arange(n_users), lengths)
+    
+    def segment_sum(values):
+        return np.add.reduceat(values, starts)
+    
+    is_income = ~is_expense
+    is_weekend = day_of_week >= 5
+    expense_amounts = np.where(is_expense, amounts, 0.0)
+    is_small = is_expense & (amounts < 20)
+    
+    expense_count = segment_sum(is_expense.astype(np.int64))
+    total_spending = segment_sum(expense_amounts)
+    avg_expense = np.divide(total_spending, expense_count,
+                            out=np.zeros_like(total_spending), where=expense_count > 0)
+    is_large = is_expense & (amounts > np.repeat(avg_expense, lengths) * 3)
+    
+    # The small-purchase total is only reported once the count crosses 60%
+    # of expenses, so skip the masked sum unless some user needs it
+    small_count = segment_sum(is_small.astype(np.int64))
+    if np.any(small_count > expense_count * 0.6):
+        small_total = segment_sum(np.where(is_small, amounts, 0.0))
+    else:
+        small_total = np.zeros(n_users, dtype=np.float64)
+    
+    # Per-user category totals, keyed by (user, category)
+    keys = (user_idx * n_categories + category_idx)[is_expense]
+    category_totals = np.bincount(keys, weights=amounts[is_expense], minlength=n_users * n_categories)
+    first_seen = np.full(n_users * n_categories, n, dtype=np.int64)
+    np.minimum.at(first_seen, keys, np.flatnonzero(is_expense))
+    
+    stats = {
+        "expense_count": expense_count,
+        "weekend_spending": segment_sum(np.where(is_weekend, expense_amounts, 0.0)),
+        "weekday_spending": segment_sum(np.where(is_weekend, 0.0, expense_amounts)),
+        "total_spending": total_spending,
+        "small_count": small_count,
+        "small_total": small_total,
+        "large_count": segment_sum(is_large.astype(np.int64)),
+        "income_count": segment_sum(is_income.astype(np.int64)),
+        "total_income": segment_sum(np.where(is_income, amounts, 0.0)),
+        "income_max": np.maximum.reduceat(np.where(is_income, amounts, -np.inf), starts),
+        "income_min": np.minimum.reduceat(np.where(is_income, amounts, np.inf), starts),
+        "subscription_count": segment_sum(is_subscription.astype(np.int64)),
+        "subscription_total": segment_sum(np.where(is_subscription, amounts, 0.0)),
+    }
+    return (stats, category_totals.reshape(n_users, n_categories),
+            first_seen.reshape(n_users, n_categories))
+
+
+# Column layout of the fused kernel's output arrays
+_COUNT_FIELDS = ("expense_count", "small_count", "large_count", "income_count", "subscription_count")
+_SUM_FIELDS = ("weekend_spending", "weekday_spending", "total_spending", "small_total",
+               "total_income", "income_max", "income_min", "subscription_total")
+
+
+def _reduce_segments_kernel(amounts, day_of_week, is_expense, is_subscription,
+                            category_idx, starts, lengths, n_categories):
+    """
+    Fused single-pass version of the segmented reductions.
+    
+    Written as plain loops for Numba: every aggregate for a user is
+    accumulated in one sweep over that user's rows (plus a second sweep
+    for the large-expense count, which needs the mean), with no
+    temporary arrays.
+    """
+    n = amounts.size
+    n_users = starts.size
+    counts = np.zeros((n_users, 5), dtype=np.int64)
+    sums = np.zeros((n_users, 8), dtype=np.float64)
+    category_totals = np.zeros((n_users, n_categories), dtype=np.float64)
+    first_seen = np.full((n_users, n_categories), n, dtype=np.int64)
+    
+    for u in range(n_users):
+        lo = starts[u]
+        hi = lo + lengths[u]
+        sums[u, 5] = -np.inf
+        sums[u, 6] = np.inf
+        for i in range(lo, hi):
+            amount = amounts[i]
+            if is_expense[i]:
+                counts[u, 0] += 1
+                sums[u, 2] += amount
+                if day_of_week[i] >= 5:
+                    sums[u, 0] += amount
+                else:
+                    sums[u, 1] += amount
+                if amount < 20:
+                    counts[u, 1] += 1
+                    sums[u, 3] += amount
+                if is_subscription[i]:
+                    counts[u, 4] += 1
+                    sums[u, 7] += amount
+                c = category_idx[i]
+                category_totals[u, c] += amount
+                if i < first_seen[u, c]:
+                    first_seen[u, c] = i
+            else:
+                counts[u, 3] += 1
+                sums[u, 4] += amount
+                if amount > sums[u, 5]:
+                    sums[u, 5] = amount
+                if amount < sums[u, 6]:
+                    sums[u, 6] = amount
         
-        if t.type == "EXPENSE":
-            expense_transactions.append(tx_data)
-        else:
-            income_transactions.append(tx_data)
+        if counts[u, 0] > 0:
+            threshold = sums[u, 2] / counts[u, 0] * 3
+            for i in range(lo, hi):
+                if is_expense[i] and amounts[i] > threshold:
+                    counts[u, 2] += 1
     
-    # Pattern 1: Weekend spending
-    weekend_spending = sum(t["amount"] for t in expense_transactions if t["day_of_week"] >= 5)
-    weekday_spending = sum(t["amount"] for t in expense_transactions if t["day_of_week"] < 5)
+    return counts, sums, category_totals, first_seen
+
+
+def _reduce_segments_jit(*args):
+    """Run the compiled kernel and unpack its columns into named stats."""
+    counts, sums, category_totals, first_seen = _compiled_kernel(*args)
+    stats = {name: counts[:, i] for i, name in enumerate(_COUNT_FIELDS)}
+    stats.update({name: sums[:, i] for i, name in enumerate(_SUM_FIELDS)})
+    return stats, category_totals, first_seen
+
+
+if njit is not None:
+    _compiled_kernel = njit(cache=True)(_reduce_segments_kernel)
+    # Compile at import so the first request does not pay the JIT cost
+    _compiled_kernel(
+        np.zeros(1), np.zeros(1, dtype=np.int8), np.ones(1, dtype=bool), np.zeros(1, dtype=bool),
+        np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64), np.ones(1, dtype=np.int64), 1
+    )
+else:
+    _reduce_segments_jit = None
+
+
+def iter_patterns(stats: dict, strengths: List[str], improvements: List[str]) -> Iterator[dict]:
+    """
+    Yield each spending pattern as soon as it is detected.
     
-    if weekend_spending > weekday_spending * 0.5 and len(expense_transactions) >= 5:
-        patterns.append({
+    Args:
+        stats: One user's aggregates from ``user_stats_batch``
+        strengths: Receives strengths noted while detecting patterns
+        improvements: Receives improvement areas noted while detecting patterns
+        
+    Yields:
+        Pattern dicts matching the ``SpendingPattern`` schema
+    """
+    expense_count = int(stats["expense_count"])
+    total_spending = stats["total_spending"]
+    
+    # Pattern 1: Weekend spending
+    if stats["weekend_spending"] > stats["weekday_spending"] * 0.5 and expense_count >= 5:
+        yield {
             "pattern_type": "weekend_spender",
             "description": "You tend to spend significantly more on weekends",
             "impact": "negative",
             "recommendation": "Plan weekend activities in advance to avoid impulse spending"
-        })
+        }
         improvements.append("Reduce weekend impulse spending")
     
     # Pattern 2: Category concentration
-    category_spending = defaultdict(float)
-    for t in expense_transactions:
-        category_spending[t["category"]] += t["amount"]
-    
-    total_spending = sum(category_spending.values())
-    for category, amount in category_spending.items():
-        if total_spending > 0:
-            percentage = (amount / total_spending) * 100
-            if percentage > 40:
-                patterns.append({
-                    "pattern_type": "category_heavy",
-                    "description": f"{category} accounts for {percentage:.0f}% of your spending",
-                    "impact": "neutral",
-                    "recommendation": f"Review if {category} spending aligns with your priorities"
-                })
+    if total_spending > 0:
+        # One broadcast for every category; only heavy ones need formatting
+        percentages = stats["category_totals"] / total_spending * 100
+        heavy = percentages > 40
+        for category, percentage in zip(stats["category_names"][heavy], percentages[heavy]):
+            yield {
+                "pattern_type": "category_heavy",
+                "description": f"{category} accounts for {percentage:.0f}% of your spending",
+                "impact": "neutral",
+                "recommendation": f"Review if {category} spending aligns with your priorities"
+            }
     
     # Pattern 3: Small frequent purchases
-    small_purchases = [t for t in expense_transactions if t["amount"] < 20]
-    if len(small_purchases) > len(expense_transactions) * 0.6:
-        total_small = sum(t["amount"] for t in small_purchases)
-        patterns.append({
+    if stats["small_count"] > expense_count * 0.6:
+        yield {
             "pattern_type": "small_purchases",
-            "description": f"Many small purchases adding up to ${total_small:.2f}",
+            "description": f"Many small purchases adding up to ${stats['small_total']:.2f}",
             "impact": "negative",
             "recommendation": "Small purchases can add up quickly. Consider tracking these more carefully."
-        })
+        }
         improvements.append("Monitor small, frequent purchases")
     
     # Pattern 4: Large irregular expenses
-    if expense_transactions:
-        amounts = [t["amount"] for t in expense_transactions]
-        avg_expense = sum(amounts) / len(amounts)
-        large_expenses = [t for t in expense_transactions if t["amount"] > avg_expense * 3]
-        
-        if large_expenses:
-            patterns.append({
-                "pattern_type": "irregular_large",
-                "description": f"Found {len(large_expenses)} unusually large expense(s)",
-                "impact": "neutral",
-                "recommendation": "Plan for large expenses by setting aside money in advance"
-            })
+    if expense_count and stats["large_count"]:
+        yield {
+            "pattern_type": "irregular_large",
+            "description": f"Found {int(stats['large_count'])} unusually large expense(s)",
+            "impact": "neutral",
+            "recommendation": "Plan for large expenses by setting aside money in advance"
+        }
     
     # Pattern 5: Consistent income
-    if len(income_transactions) >= 2:
-        income_amounts = [t["amount"] for t in income_transactions]
-        if max(income_amounts) - min(income_amounts) < sum(income_amounts) / len(income_amounts) * 0.1:
-            patterns.append({
+    income_count = int(stats["income_count"])
+    if income_count >= 2:
+        if stats["income_max"] - stats["income_min"] < stats["total_income"] / income_count * 0.1:
+            yield {
                 "pattern_type": "stable_income",
                 "description": "Your income is consistent and predictable",
                 "impact": "positive",
                 "recommendation": None
-            })
+            }
             strengths.append("Stable, predictable income")
     
     # Pattern 6: Subscription detection
-    subscription_keywords = ["netflix", "spotify", "hulu", "subscription", "monthly", "membership"]
-    subscriptions = [t for t in expense_transactions 
-                     if any(kw in t["description"] for kw in subscription_keywords)]
-    
-    if subscriptions:
-        total_subs = sum(t["amount"] for t in subscriptions)
-        patterns.append({
+    subscription_count = int(stats["subscription_count"])
+    if subscription_count:
+        yield {
             "pattern_type": "subscriptions",
-            "description": f"Detected {len(subscriptions)} subscription payment(s) totaling ${total_subs:.2f}",
+            "description": f"Detected {subscription_count} subscription payment(s) totaling ${stats['subscription_total']:.2f}",
             "impact": "neutral",
             "recommendation": "Review subscriptions regularly and cancel any you don't use"
-        })
+        }
+
+
+def _build_result(stats: dict) -> dict:
+    """Turn one user's aggregates into patterns, risk score and personality."""
+    strengths = []
+    improvements = []
+    patterns = list(iter_patterns(stats, strengths, improvements))
+    
+    total_spending = stats["total_spending"]
+    income_count = int(stats["income_count"])
+    total_income = stats["total_income"]
     
     # Calculate risk score
     risk_score = 5
     negative_patterns = sum(1 for p in patterns if p["impact"] == "negative")
     positive_patterns = sum(1 for p in patterns if p["impact"] == "positive")
     
-    if total_spending > 0 and income_transactions:
-        total_income = sum(t["amount"] for t in income_transactions)
+    if total_spending > 0 and income_count:
         if total_spending > total_income:
             risk_score += 2
             improvements.append("Spending exceeds income")
@@ -219,21 +567,64 @@ def analyze_patterns(transactions: List[Transaction]) -> dict:
     }
 
 
-@router.post("/patterns", response_model=PatternsResponse)
-async def analyze_spending_patterns(request: PatternsRequest):
+patterns_batcher = MicroBatcher(
+    user_stats_batch,
+    max_batch=settings.PATTERNS_BATCH_SIZE,
+    max_wait=settings.PATTERNS_BATCH_WAIT_SECONDS
+)
+
+
+async def stream_patterns(transactions: List[Transaction]) -> AsyncIterator[dict]:
+    """Yield a user's spending patterns one at a time as they are detected."""
+    # Concurrent requests are aggregated together, off the event loop
+    stats = await patterns_batcher.submit(transactions)
+    if stats is None:
+        return
+    
+    for pattern in iter_patterns(stats, [], []):
+        yield pattern
+
+
+async def _ndjson(items: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """Encode each item as one line of newline-delimited JSON."""
+    async for item in items:
+        yield orjson.dumps(item) + b"\n"
+
+
+@router.post(
+    "/patterns",
+    responses={200: {"model": PatternsResponse}},
+    openapi_extra=PATTERNS_REQUEST_BODY
+)
+async def analyze_spending_patterns(request: Request):
     """
     Analyze user's spending patterns and provide behavioral insights.
     
     Identifies patterns like weekend spending, category concentration,
     and provides a spending personality assessment.
     """
-    result = analyze_patterns(request.transactions)
+    body = await _decode_request(request)
+    
+    # Concurrent requests are aggregated together, off the event loop
+    stats = await patterns_batcher.submit(body.transactions)
+    result = _build_result(stats) if stats is not None else _get_empty_result()
+    
+    # The result already has the response shape; serialize it once, unvalidated
+    return ORJSONResponse(content={"user_id": body.user_id, **result})
+
+
+@router.post("/patterns/stream", openapi_extra=PATTERNS_REQUEST_BODY)
+async def stream_spending_patterns(request: Request):
+    """
+    Stream detected spending patterns as newline-delimited JSON.
     
-    return PatternsResponse(
-        user_id=request.user_id,
-        patterns=[SpendingPattern(**p) for p in result["patterns"]],
-        spending_personality=result["spending_personality"],
-        risk_score=result["risk_score"],
-        strengths=result["strengths"],
-        areas_for_improvement=result["areas_for_improvement"]
+    Each line is one ``SpendingPattern`` object, written as soon as it is
+    detected, so clients with large histories can start rendering before
+    the full analysis is serialized. Use ``/patterns`` for the risk score
+    and personality summary.
+    """
+    body = await _decode_request(request)
+    return StreamingResponse(
+        _ndjson(stream_patterns(body.transactions)),
+        media_type="application/x-ndjson"
     )
@@ -3,29 +3,200 @@ AI Agent - Core AI functionality.
 Provides AI capabilities using OpenAI or rule-based fallback.
 """
 
-from typing import Dict, List, Optional
+from bisect import bisect_right
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import os
+import re
 
+import httpx
+import numpy as np
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+except ImportError:
+    h2 = None
+from fastapi import Request
+
+from app.core.cache import ExactCache, LLMCache, completion_key
 from app.core.config import settings
 
 
+# Keyword -> chat topic; a keyword matches anywhere in the message,
+# including inside longer words ("overspending", "budgetary")
+CHAT_KEYWORDS: Dict[str, str] = {
+    **dict.fromkeys(("save", "saving", "savings"), "save"),
+    **dict.fromkeys(("budget", "budgeting"), "budget"),
+    **dict.fromkeys(("invest", "investing", "investment"), "invest"),
+    **dict.fromkeys(("debt", "loan", "credit"), "debt"),
+    **dict.fromkeys(("spend", "spending", "expense"), "spend"),
+}
+
+# When a message touches several topics, the first one listed wins
+CHAT_TOPIC_PRIORITY = ("save", "budget", "invest", "debt", "spend")
+
+CHAT_RESPONSES: Dict[str, str] = {
+    "save": (
+        "Great question about savings! Here are some tips:\n"
+        "1. Start with the 50/30/20 rule\n"
+        "2. Set up automatic transfers to savings\n"
+        "3. Track your spending to find areas to cut\n"
+        "4. Build an emergency fund with 3-6 months of expenses"
+    ),
+    "budget": (
+        "Budgeting is key to financial success! Try these steps:\n"
+        "1. List all your income sources\n"
+        "2. Track every expense for a month\n"
+        "3. Categorize spending (needs vs wants)\n"
+        "4. Set realistic limits for each category\n"
+        "5. Review and adjust monthly"
+    ),
+    "invest": (
+        "Smart thinking about investing! General tips:\n"
+        "1. First, pay off high-interest debt\n"
+        "2. Build an emergency fund\n"
+        "3. Take advantage of employer 401(k) matching\n"
+        "4. Consider low-cost index funds for beginners\n"
+        "Note: Consider consulting a financial advisor for personalized advice."
+    ),
+    "debt": (
+        "Managing debt is important! Consider:\n"
+        "1. List all debts with interest rates\n"
+        "2. Pay minimums on all, extra on highest rate (avalanche method)\n"
+        "3. Or pay smallest debts first for motivation (snowball method)\n"
+        "4. Avoid taking on new debt while paying off existing"
+    ),
+    "spend": (
+        "Your current monthly expenses are ${monthly_expenses:,.2f}.\n"
+        "Tips to reduce spending:\n"
+        "1. Review subscriptions and cancel unused ones\n"
+        "2. Cook at home more often\n"
+        "3. Use the 24-hour rule for non-essential purchases\n"
+        "4. Look for free entertainment options"
+    ),
+}
+
+DEFAULT_CHAT_RESPONSE = (
+    "I'm here to help with your finances! You can ask me about:\n"
+    "• Saving money and building an emergency fund\n"
+    "• Creating and sticking to a budget\n"
+    "• Managing debt effectively\n"
+    "• Understanding your spending patterns\n"
+    "• General investment principles\n\n"
+    "What would you like to know more about?"
+)
+
+# Savings rate brackets: below 0%, below 10%, below 20%, and 20% or more
+SAVINGS_RATE_THRESHOLDS = (0, 10, 20)
+
+SAVINGS_RATE_ADVICE = (
+    "⚠️ **Alert**: You're spending more than you earn this month. "
+    "Review your expenses immediately and identify non-essential spending to cut.",
+    "📊 **Savings Rate**: Your current savings rate is below 10%. "
+    "Financial experts recommend saving at least 20% of your income. "
+    "Consider the 50/30/20 rule: 50% needs, 30% wants, 20% savings.",
+    "📊 **Good Progress**: You're saving {savings_rate:.1f}% of your income. "
+    "Try to increase this to 20% by cutting discretionary spending.",
+    "🌟 **Excellent**: You're saving {savings_rate:.1f}% of your income! "
+    "Consider investing your extra savings in a diversified portfolio.",
+)
+
+# Category -> (percentage of spending that triggers advice, advice template)
+CATEGORY_RULES: Dict[str, Tuple[float, str]] = {
+    "Food & Dining": (
+        25.0,
+        "🍽️ **Food & Dining** accounts for {percentage:.1f}% of your spending. "
+        "Consider meal prepping or cooking at home more often to reduce this."
+    ),
+    "Entertainment": (
+        15.0,
+        "🎬 **Entertainment** spending is {percentage:.1f}% of expenses. "
+        "Look for free or low-cost alternatives for entertainment."
+    ),
+    "Shopping": (
+        20.0,
+        "🛍️ **Shopping** represents {percentage:.1f}% of your spending. "
+        "Try implementing a 24-hour rule before non-essential purchases."
+    ),
+}
+
+def keyword_pattern(keywords: Dict[str, str]) -> "re.Pattern":
+    """
+    Compile keywords into one regex that finds every occurrence in a message.
+    
+    The alternation sits inside a lookahead, so overlapping occurrences are
+    all reported, exactly as a substring check per keyword would see them.
+    """
+    alternation = "|".join(re.escape(word) for word in sorted(keywords, key=len, reverse=True))
+    return re.compile(f"(?=({alternation}))")
+
+
+def match_topic(message: str, keywords: Dict[str, str], pattern: "re.Pattern",
+                priority: tuple) -> Optional[str]:
+    """
+    Return the highest-priority topic whose keywords appear in a message.
+    
+    The lowercased message is scanned once with ``pattern`` (from
+    ``keyword_pattern(keywords)``) instead of once per keyword.
+    """
+    topics = {keywords[word] for word in pattern.findall(message.lower())}
+    return next((topic for topic in priority if topic in topics), None)
+
+
+CHAT_KEYWORD_PATTERN = keyword_pattern(CHAT_KEYWORDS)
+
+
 class FinancialAIAgent:
     """AI Agent for financial advice and analysis."""
     
     def __init__(self):
         self.openai_available = False
         self.client = None
+        # Semantic matching is only for chat messages without financial
+        # context; prompts carrying a user's figures are matched exactly, so
+        # one user's answer is never served for another user's numbers
+        self.chat_cache = LLMCache(
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+            max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS
+        )
+        self._exact_cache = ExactCache(
+            max_entries=settings.EXACT_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.EXACT_CACHE_TTL_SECONDS
+        )
+        
+        self._http: Optional[httpx.AsyncClient] = None
         
         # Try to initialize OpenAI client
         if settings.OPENAI_API_KEY:
             try:
-                from openai import OpenAI
-                self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+                from openai import AsyncOpenAI
+                # One pooled HTTP client, shared by every request in this worker.
+                # HTTP/2 multiplexes concurrent completions over one TLS connection.
+                self._http = httpx.AsyncClient(
+                    http2=h2 is not None,
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                    timeout=httpx.Timeout(30.0, connect=5.0)
+                )
+                self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=self._http)
                 self.openai_available = True
             except Exception as e:
                 print(f"OpenAI not available: {e}")
     
-    def get_advice(self, financial_data: Dict) -> str:
+    async def warm_up(self) -> None:
+        """Open the OpenAI connection pool before the first user request."""
+        if not self.openai_available:
+            return
+        try:
+            await self.client.models.list()
+        except Exception as e:
+            print(f"OpenAI warm-up failed: {e}")
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._http is not None:
+            await self._http.aclose()
+    
+    async def get_advice(self, financial_data: Dict) -> str:
         """
         Generate financial advice based on user's financial data.
         
@@ -35,12 +206,27 @@ class FinancialAIAgent:
         Returns:
             Personalized financial advice string
         """
+        return "".join([token async for token in self.stream_advice(financial_data)])
+    
+    async def stream_advice(self, financial_data: Dict) -> AsyncIterator[str]:
+        """
+        Stream financial advice as it is generated.
+        
+        Args:
+            financial_data: Dictionary containing financial metrics
+            
+        Yields:
+            Chunks of the advice text, in order
+        """
         if self.openai_available:
-            return self._get_ai_advice(financial_data)
-        return self._get_rule_based_advice(financial_data)
+            async for token in self._get_ai_advice(financial_data):
+                yield token
+        else:
+            yield self._get_rule_based_advice(financial_data)
     
-    def _get_ai_advice(self, financial_data: Dict) -> str:
-        """Generate advice using OpenAI."""
+    async def _get_ai_advice(self, financial_data: Dict) -> AsyncIterator[str]:
+        """Stream advice tokens from OpenAI."""
+        started = False
         try:
             # Format the data for the prompt
             total_balance = financial_data.get('totalBalance', 0)
@@ -65,21 +251,62 @@ class FinancialAIAgent:
                 category_breakdown=category_breakdown
             )
             
-            response = self.client.chat.completions.create(
+            # Keep the system prefix byte-identical so OpenAI can cache it
+            messages = [
+                {"role": "system", "content": settings.SYSTEM_PROMPT},
+                {"role": "system", "content": settings.ADVICE_INSTRUCTIONS},
+                {"role": "user", "content": prompt}
+            ]
+            
+            # The prompt carries the user's figures, so only an identical
+            # prompt may be answered from the cache
+            request_key = completion_key(settings.OPENAI_MODEL, messages, 0.7)
+            cached = self._exact_cache.get(request_key)
+            if cached is not None:
+                yield cached
+                return
+            
+            stream = await self.client.chat.completions.create(
                 model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": settings.SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=messages,
                 max_tokens=500,
-                temperature=0.7
+                temperature=0.7,
+                stream=True
             )
             
-            return response.choices[0].message.content
+            parts = []
+            async for token in _iter_content(stream):
+                started = True
+                parts.append(token)
+                yield token
+            
+            advice = "".join(parts)
+            self._exact_cache.put(request_key, advice)
             
         except Exception as e:
             print(f"Error getting AI advice: {e}")
-            return self._get_rule_based_advice(financial_data)
+            # Only fall back if nothing has been sent to the client yet
+            if not started:
+                yield self._get_rule_based_advice(financial_data)
+    
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed text for the semantic cache; returns None if embedding fails."""
+        try:
+            response = await self.client.embeddings.create(
+                model=settings.EMBEDDING_MODEL,
+                input=text
+            )
+            return np.asarray(response.data[0].embedding, dtype=np.float32)
+        except Exception as e:
+            print(f"Error embedding cache key: {e}")
+            return None
+    
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return response cache counters for the health endpoint."""
+        return {
+            "exact": self._exact_cache.stats(),
+            "chat": self.chat_cache.stats()
+        }
     
     def _get_rule_based_advice(self, financial_data: Dict) -> str:
         """Generate advice using rules when AI is not available."""
@@ -93,51 +320,22 @@ class FinancialAIAgent:
         # Savings rate analysis
         if monthly_income > 0:
             savings_rate = (monthly_savings / monthly_income) * 100
-            
-            if savings_rate < 0:
-                advice_parts.append(
-                    "⚠️ **Alert**: You're spending more than you earn this month. "
-                    "Review your expenses immediately and identify non-essential spending to cut."
-                )
-            elif savings_rate < 10:
-                advice_parts.append(
-                    "📊 **Savings Rate**: Your current savings rate is below 10%. "
-                    "Financial experts recommend saving at least 20% of your income. "
-                    "Consider the 50/30/20 rule: 50% needs, 30% wants, 20% savings."
-                )
-            elif savings_rate < 20:
-                advice_parts.append(
-                    f"📊 **Good Progress**: You're saving {savings_rate:.1f}% of your income. "
-                    "Try to increase this to 20% by cutting discretionary spending."
-                )
-            else:
-                advice_parts.append(
-                    f"🌟 **Excellent**: You're saving {savings_rate:.1f}% of your income! "
-                    "Consider investing your extra savings in a diversified portfolio."
-                )
+            bracket = bisect_right(SAVINGS_RATE_THRESHOLDS, savings_rate)
+            advice_parts.append(SAVINGS_RATE_ADVICE[bracket].format(savings_rate=savings_rate))
         
         # Category-specific advice
         if spending_by_category:
             total_expenses = sum(spending_by_category.values())
             
-            for category, amount in spending_by_category.items():
-                percentage = (amount / total_expenses * 100) if total_expenses > 0 else 0
-                
-                if category == "Food & Dining" and percentage > 25:
-                    advice_parts.append(
-                        f"🍽️ **Food & Dining** accounts for {percentage:.1f}% of your spending. "
-                        "Consider meal prepping or cooking at home more often to reduce this."
-                    )
-                elif category == "Entertainment" and percentage > 15:
-                    advice_parts.append(
-                        f"🎬 **Entertainment** spending is {percentage:.1f}% of expenses. "
-                        "Look for free or low-cost alternatives for entertainment."
-                    )
-                elif category == "Shopping" and percentage > 20:
-                    advice_parts.append(
-                        f"🛍️ **Shopping** represents {percentage:.1f}% of your spending. "
-                        "Try implementing a 24-hour rule before non-essential purchases."
-                    )
+            if total_expenses > 0:
+                for category, amount in spending_by_category.items():
+                    rule = CATEGORY_RULES.get(category)
+                    if rule is None:
+                        continue
+                    
+                    percentage = amount / total_expenses * 100
+                    if percentage > rule[0]:
+                        advice_parts.append(rule[1].format(percentage=percentage))
         
         # Emergency fund advice
         if monthly_expenses > 0:
@@ -151,7 +349,7 @@ class FinancialAIAgent:
             "Start tracking your income and expenses to receive personalized financial advice."
         )
     
-    def chat(self, message: str, context: Dict) -> str:
+    async def chat(self, message: str, context: Dict) -> str:
         """
         Handle chat messages from users.
         
@@ -162,12 +360,28 @@ class FinancialAIAgent:
         Returns:
             AI response string
         """
+        return "".join([token async for token in self.stream_chat(message, context)])
+    
+    async def stream_chat(self, message: str, context: Dict) -> AsyncIterator[str]:
+        """
+        Stream a chat response as it is generated.
+        
+        Args:
+            message: User's message
+            context: Financial context for the conversation
+            
+        Yields:
+            Chunks of the response text, in order
+        """
         if self.openai_available:
-            return self._ai_chat(message, context)
-        return self._rule_based_chat(message, context)
+            async for token in self._ai_chat(message, context):
+                yield token
+        else:
+            yield self._rule_based_chat(message, context)
     
-    def _ai_chat(self, message: str, context: Dict) -> str:
-        """Handle chat using OpenAI."""
+    async def _ai_chat(self, message: str, context: Dict) -> AsyncIterator[str]:
+        """Stream chat tokens from OpenAI."""
+        started = False
         try:
             context_str = f"""
 User's Financial Context:
@@ -176,87 +390,93 @@ User's Financial Context:
 - Monthly Expenses: ${context.get('monthlyExpenses', 0):,.2f}
 """
             
-            response = self.client.chat.completions.create(
+            # Keep the system prefix byte-identical so OpenAI can cache it
+            messages = [
+                {"role": "system", "content": settings.SYSTEM_PROMPT},
+                {"role": "system", "content": context_str},
+                {"role": "user", "content": message}
+            ]
+            
+            # Identical payloads are answered from the exact cache first
+            request_key = completion_key(settings.OPENAI_MODEL, messages, 0.7)
+            cached = self._exact_cache.get(request_key)
+            if cached is not None:
+                yield cached
+                return
+            
+            # Near-duplicate questions share answers only when no financial
+            # context was sent; the context figures make an answer user-specific
+            embedding = None
+            if not context:
+                embedding = await self._embed(message)
+                cached = self.chat_cache.get(embedding)
+                if cached is not None:
+                    self._exact_cache.put(request_key, cached)
+                    yield cached
+                    return
+            
+            stream = await self.client.chat.completions.create(
                 model=settings.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": settings.SYSTEM_PROMPT + "\n\n" + context_str},
-                    {"role": "user", "content": message}
-                ],
+                messages=messages,
                 max_tokens=300,
-                temperature=0.7
+                temperature=0.7,
+                stream=True
             )
             
-            return response.choices[0].message.content
+            parts = []
+            async for token in _iter_content(stream):
+                started = True
+                parts.append(token)
+                yield token
+            
+            response = "".join(parts)
+            self._exact_cache.put(request_key, response)
+            self.chat_cache.put(embedding, response)
             
         except Exception as e:
             print(f"Error in AI chat: {e}")
-            return self._rule_based_chat(message, context)
+            # Only fall back if nothing has been sent to the client yet
+            if not started:
+                yield self._rule_based_chat(message, context)
     
     def _rule_based_chat(self, message: str, context: Dict) -> str:
         """Handle chat using rules when AI is not available."""
-        message_lower = message.lower()
-        
-        # Simple keyword-based responses
-        if any(word in message_lower for word in ["save", "saving", "savings"]):
-            return (
-                "Great question about savings! Here are some tips:\n"
-                "1. Start with the 50/30/20 rule\n"
-                "2. Set up automatic transfers to savings\n"
-                "3. Track your spending to find areas to cut\n"
-                "4. Build an emergency fund with 3-6 months of expenses"
-            )
-        
-        if any(word in message_lower for word in ["budget", "budgeting"]):
-            return (
-                "Budgeting is key to financial success! Try these steps:\n"
-                "1. List all your income sources\n"
-                "2. Track every expense for a month\n"
-                "3. Categorize spending (needs vs wants)\n"
-                "4. Set realistic limits for each category\n"
-                "5. Review and adjust monthly"
-            )
-        
-        if any(word in message_lower for word in ["invest", "investing", "investment"]):
-            return (
-                "Smart thinking about investing! General tips:\n"
-                "1. First, pay off high-interest debt\n"
-                "2. Build an emergency fund\n"
-                "3. Take advantage of employer 401(k) matching\n"
-                "4. Consider low-cost index funds for beginners\n"
-                "Note: Consider consulting a financial advisor for personalized advice."
-            )
-        
-        if any(word in message_lower for word in ["debt", "loan", "credit"]):
-            return (
-                "Managing debt is important! Consider:\n"
-                "1. List all debts with interest rates\n"
-                "2. Pay minimums on all, extra on highest rate (avalanche method)\n"
-                "3. Or pay smallest debts first for motivation (snowball method)\n"
-                "4. Avoid taking on new debt while paying off existing"
-            )
+        topic = match_topic(message, CHAT_KEYWORDS, CHAT_KEYWORD_PATTERN, CHAT_TOPIC_PRIORITY)
         
-        if any(word in message_lower for word in ["spend", "spending", "expense"]):
-            monthly_expenses = context.get('monthlyExpenses', 0)
-            return (
-                f"Your current monthly expenses are ${monthly_expenses:,.2f}.\n"
-                "Tips to reduce spending:\n"
-                "1. Review subscriptions and cancel unused ones\n"
-                "2. Cook at home more often\n"
-                "3. Use the 24-hour rule for non-essential purchases\n"
-                "4. Look for free entertainment options"
+        if topic == "spend":
+            return CHAT_RESPONSES[topic].format(
+                monthly_expenses=context.get('monthlyExpenses', 0)
             )
-        
-        # Default response
-        return (
-            "I'm here to help with your finances! You can ask me about:\n"
-            "• Saving money and building an emergency fund\n"
-            "• Creating and sticking to a budget\n"
-            "• Managing debt effectively\n"
-            "• Understanding your spending patterns\n"
-            "• General investment principles\n\n"
-            "What would you like to know more about?"
-        )
+        return CHAT_RESPONSES.get(topic, DEFAULT_CHAT_RESPONSE)
+
+
+async def _iter_content(stream) -> AsyncIterator[str]:
+    """Yield the non-empty text deltas from an OpenAI completion stream."""
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        content = chunk.choices[0].delta.content
+        if content:
+            yield content
+
+
+# Line terminators recognized by the SSE format
+_SSE_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+
+def to_sse(data: str, event: Optional[str] = None) -> str:
+    """
+    Frame a piece of text as a Server-Sent Events message.
+    
+    Multi-line text is split across several ``data:`` fields, as required
+    by the SSE format, so newlines inside tokens survive the round trip.
+    SSE also ends a line at a bare carriage return, so that is split on too.
+    """
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in _SSE_LINE_BREAK.split(data))
+    return "\n".join(lines) + "\n\n"
 
 
-# Global agent instance
-agent = FinancialAIAgent()
+def get_agent(request: Request) -> FinancialAIAgent:
+    """FastAPI dependency returning the agent created at startup."""
+    return request.app.state.agent
@@ -0,0 +1,113 @@
+"""
+Micro-batching for CPU-bound request handlers.
+Groups requests that arrive close together so they can be processed in one call.
+"""
+
+import asyncio
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+
+class MicroBatcher:
+    """
+    Collect concurrent work items and process them as a batch.
+    
+    A background task waits for the first item, then gathers more until
+    ``max_batch`` items are queued or ``max_wait`` seconds have passed.
+    When nothing else is queued the item is processed on its own right
+    away, so an idle service adds no batching latency.
+    
+    ``process_batch`` receives a list of items and must return a list of
+    results in the same order. It runs in the threadpool, one call per
+    batch, and a batch still running does not hold up the next one. If a
+    batch call raises, its items are retried one at a time, so a bad item
+    only fails its own request.
+    """
+    
+    def __init__(self, process_batch: Callable[[List[Any]], List[Any]],
+                 max_batch: int = 32, max_wait: float = 0.01):
+        self.process_batch = process_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._batches: Set[asyncio.Task] = set()
+    
+    async def start(self) -> None:
+        """Start the background batching task."""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the background task, failing any requests still queued or running."""
+        if self._task is None:
+            return
+        tasks = (self._task, *self._batches)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        while not self._queue.empty():
+            future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Batcher stopped"))
+        self._task = None
+        self._queue = None
+    
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result."""
+        if self._task is None:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((future, item))
+        return await future
+    
+    async def _run(self) -> None:
+        """Background loop: collect a batch and hand it off for processing."""
+        while True:
+            batch = [await self._queue.get()]
+            if not self._queue.empty():
+                await self._collect(batch)
+            
+            # Processed in its own task, so the next batch is collected meanwhile
+            task = asyncio.create_task(self._process(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+    
+    async def _process(self, batch: List[Tuple[asyncio.Future, Any]]) -> None:
+        """Process one batch and resolve its futures."""
+        try:
+            results = await run_in_threadpool(self.process_batch, [item for _, item in batch])
+        except asyncio.CancelledError:
+            for future, _ in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Batcher stopped"))
+            raise
+        except Exception as e:
+            if len(batch) == 1:
+                future = batch[0][0]
+                if not future.done():
+                    future.set_exception(e)
+                return
+            # Retry each item alone, so only the bad ones see the error
+            for entry in batch:
+                await self._process([entry])
+            return
+        
+        for (future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+    
+    async def _collect(self, batch: List[Tuple[asyncio.Future, Any]]) -> None:
+        """Add queued items to ``batch`` until it is full or the wait expires."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
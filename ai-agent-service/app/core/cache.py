@@ -0,0 +1,150 @@
+"""
+Response caching for LLM calls.
+Keeps recent completions so near-duplicate questions skip the OpenAI round trip.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def completion_key(model: str, messages: List[Dict[str, str]], temperature: float) -> str:
+    """Return a SHA-256 digest identifying an exact chat completion request."""
+    payload = {"model": model, "messages": messages, "temperature": temperature}
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class ExactCache:
+    """
+    Exact-match cache keyed on a request digest.
+
+    Entries expire after ``ttl_seconds`` and the least recently used entry
+    is evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion for ``key`` if present and fresh."""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: str, response: str) -> None:
+        """Store a completion under ``key``."""
+        if not response:
+            return
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for monitoring."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+class LLMCache:
+    """
+    Semantic cache mapping query embeddings to completions.
+
+    Embeddings are stored L2-normalized in one contiguous float32 matrix,
+    so a lookup is a single matrix-vector product followed by an argmax.
+    Entries expire after ``ttl_seconds``; when full, the least recently
+    used entry is replaced.
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 512,
+                 ttl_seconds: float = 3600.0):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        self._embeddings: Optional[np.ndarray] = None
+        self._responses: List[Optional[str]] = [None] * max_entries
+        self._created = np.zeros(max_entries, dtype=np.float64)
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._size = 0
+
+    def get(self, embedding: Optional[np.ndarray]) -> Optional[str]:
+        """Return the cached completion closest to ``embedding``, if similar enough."""
+        query = _normalize(embedding)
+        if query is None or self._size == 0 or query.shape[0] != self._embeddings.shape[1]:
+            self.misses += 1
+            return None
+
+        now = time.monotonic()
+        similarities = self._embeddings[:self._size] @ query
+        similarities[self._expired(now)] = -np.inf
+        best = int(np.argmax(similarities))
+
+        if similarities[best] < self.threshold:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._last_used[best] = now
+        return self._responses[best]
+
+    def put(self, embedding: Optional[np.ndarray], response: str) -> None:
+        """Store a completion under ``embedding``."""
+        vector = _normalize(embedding)
+        if vector is None or not response:
+            return
+
+        if self._embeddings is None or self._embeddings.shape[1] != vector.shape[0]:
+            self._embeddings = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+            self._size = 0
+
+        now = time.monotonic()
+        if self._size < self.max_entries:
+            slot = self._size
+            self._size += 1
+        else:
+            # Prefer expired entries, then the least recently used one
+            last_used = np.where(self._expired(now), -np.inf, self._last_used)
+            slot = int(np.argmin(last_used))
+
+        self._embeddings[slot] = vector
+        self._responses[slot] = response
+        self._created[slot] = now
+        self._last_used[slot] = now
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for monitoring."""
+        return {"hits": self.hits, "misses": self.misses, "entries": self._size}
+
+    def _expired(self, now: float) -> np.ndarray:
+        """Boolean mask of stored entries older than the TTL."""
+        return (now - self._created[:self._size]) > self.ttl_seconds
+
+
+def _normalize(embedding: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """Return ``embedding`` as a unit-length float32 vector, or None if unusable."""
+    if embedding is None:
+        return None
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0:
+        return None
+    return vector / norm
@@ -4,11 +4,14 @@ SmartSpend AI Agent Service
 FastAPI microservice for AI-powered financial advice and chat functionality.
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
 from app.api import advice, chat, patterns
+from app.core.agent import FinancialAIAgent
 from app.core.config import settings
 
 
@@ -16,7 +19,12 @@ from app.core.config import settings
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     print("AI Agent Service starting up...")
+    app.state.agent = FinancialAIAgent()
+    await app.state.agent.warm_up()
+    await patterns.patterns_batcher.start()
     yield
+    await patterns.patterns_batcher.stop()
+    await app.state.agent.aclose()
     print("AI Agent Service shutting down...")
 
 
@@ -24,7 +32,8 @@ app = FastAPI(
     title="SmartSpend AI Agent Service",
     description="AI-powered financial assistant microservice for SmartSpend",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -36,6 +45,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class StreamingExemptGZipMiddleware(GZipMiddleware):
+    """
+    GZip middleware that passes the streaming routes (``.../stream``) through.
+    
+    Older Starlette releases hold streamed chunks in the compressor until
+    the response ends, and none exempt NDJSON, so skipping these routes is
+    what delivers each SSE token and NDJSON line as soon as it is produced.
+    """
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Compress the text-heavy advice and pattern responses. Level 1 keeps the
+# CPU cost negligible while still shrinking repetitive English text a lot.
+app.add_middleware(StreamingExemptGZipMiddleware, minimum_size=500, compresslevel=1)
+
 # Include routers
 app.include_router(advice.router, prefix="/api", tags=["Financial Advice"])
 app.include_router(chat.router, prefix="/api", tags=["Chat"])
@@ -53,11 +82,21 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return {"status": "healthy", "cache": request.app.state.agent.cache_stats()}
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    # uvloop and httptools ship with uvicorn[standard]. For production,
+    # gunicorn -k uvicorn.workers.UvicornWorker -w 4 main:app works too.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8001,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "4"))
+    )
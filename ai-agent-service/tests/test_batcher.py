@@ -0,0 +1,110 @@
+"""
+Micro-batching of concurrent requests.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.batcher import MicroBatcher
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_results_follow_submission_order():
+    batches = []
+
+    def process(items):
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(process, max_batch=8, max_wait=0.05)
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(20)))
+        finally:
+            await batcher.stop()
+
+    assert run(scenario()) == [i * 10 for i in range(20)]
+    assert max(len(batch) for batch in batches) > 1
+    assert all(len(batch) <= 8 for batch in batches)
+
+
+def test_a_failing_item_only_fails_its_own_request():
+    calls = []
+
+    def process(items):
+        calls.append(list(items))
+        if "bad" in items:
+            raise ValueError("bad payload")
+        return [item.upper() for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(process, max_batch=8, max_wait=0.05)
+        await batcher.start()
+        try:
+            return await asyncio.gather(
+                batcher.submit("a"), batcher.submit("bad"), batcher.submit("c"),
+                return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+
+    first, bad, last = run(scenario())
+
+    assert (first, last) == ("A", "C")
+    assert isinstance(bad, ValueError)
+    # The whole batch was tried first, then each item on its own
+    assert calls[0] == ["a", "bad", "c"]
+    assert ["bad"] in calls
+
+
+def test_a_running_batch_does_not_block_the_next():
+    first_started = threading.Event()
+    second_done = threading.Event()
+
+    def process(items):
+        if items == ["slow"]:
+            first_started.set()
+            # Only finishes once the next batch has been processed
+            assert second_done.wait(timeout=5)
+        else:
+            second_done.set()
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(process, max_batch=8, max_wait=0.01)
+        await batcher.start()
+        try:
+            slow = asyncio.ensure_future(batcher.submit("slow"))
+            await asyncio.get_running_loop().run_in_executor(None, first_started.wait, 5)
+            fast = await batcher.submit("fast")
+            return await slow, fast
+        finally:
+            await batcher.stop()
+
+    assert run(scenario()) == ("slow", "fast")
+
+
+def test_stop_fails_requests_in_flight():
+    release = threading.Event()
+
+    def process(items):
+        release.wait(timeout=5)
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(process)
+        await batcher.start()
+        pending = asyncio.ensure_future(batcher.submit("x"))
+        await asyncio.sleep(0.05)
+        await batcher.stop()
+        release.set()
+        with pytest.raises(RuntimeError, match="Batcher stopped"):
+            await pending
+
+    run(scenario())
@@ -0,0 +1,75 @@
+"""
+Keyword routing of rule-based chat replies and follow-up suggestions.
+The precompiled matchers must route every message exactly as the original
+substring checks did.
+"""
+
+import pytest
+
+from app.api.chat import DEFAULT_SUGGESTIONS, SUGGESTIONS, generate_suggestions
+from app.core.agent import CHAT_RESPONSES, DEFAULT_CHAT_RESPONSE, FinancialAIAgent
+
+
+def baseline_chat_topic(message):
+    """The original if-chain in ``FinancialAIAgent._rule_based_chat``."""
+    message_lower = message.lower()
+    if any(word in message_lower for word in ["save", "saving", "savings"]):
+        return "save"
+    if any(word in message_lower for word in ["budget", "budgeting"]):
+        return "budget"
+    if any(word in message_lower for word in ["invest", "investing", "investment"]):
+        return "invest"
+    if any(word in message_lower for word in ["debt", "loan", "credit"]):
+        return "debt"
+    if any(word in message_lower for word in ["spend", "spending", "expense"]):
+        return "spend"
+    return None
+
+
+def baseline_suggestion_topic(message):
+    """The original if-chain in ``generate_suggestions``."""
+    message_lower = message.lower()
+    if any(word in message_lower for word in ["save", "saving"]):
+        return "save"
+    if any(word in message_lower for word in ["budget", "spending"]):
+        return "budget"
+    if any(word in message_lower for word in ["invest", "stock"]):
+        return "invest"
+    if any(word in message_lower for word in ["debt", "loan", "credit"]):
+        return "debt"
+    return None
+
+
+MESSAGES = [
+    "I'm overspending",
+    "Is this budgetary?",
+    "My creditcard bill is huge",
+    "I spent too much",
+    "How do I save money?",
+    "SAVINGS goals",
+    "Tips for investing in stocks",
+    "Should I pay my loan or invest?",
+    "Budgeting for debt payoff",
+    "What are my expenses?",
+    "Where does my spending go?",
+    "Unsaved changes",
+    "Hello there",
+    "",
+]
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_chat_replies_match_substring_routing(message):
+    agent = FinancialAIAgent.__new__(FinancialAIAgent)
+    context = {"monthlyExpenses": 1234.5}
+    topic = baseline_chat_topic(message)
+    expected = CHAT_RESPONSES.get(topic, DEFAULT_CHAT_RESPONSE)
+    if topic == "spend":
+        expected = expected.format(monthly_expenses=1234.5)
+    assert agent._rule_based_chat(message, context) == expected
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_suggestions_match_substring_routing(message):
+    topic = baseline_suggestion_topic(message)
+    assert generate_suggestions(message) == list(SUGGESTIONS.get(topic, DEFAULT_SUGGESTIONS))
@@ -0,0 +1,81 @@
+"""
+Exact-match prompt cache.
+"""
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import ExactCache, completion_key
+
+
+class Clock:
+    """Stand-in for ``time`` whose ``monotonic()`` only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+MESSAGES = [{"role": "system", "content": "prefix"}, {"role": "user", "content": "How do I save?"}]
+
+
+def test_completion_key_identifies_the_exact_request():
+    key = completion_key("gpt", MESSAGES, 0.7)
+
+    assert key == completion_key("gpt", [dict(m) for m in MESSAGES], 0.7)
+    assert key != completion_key("gpt", MESSAGES, 0.2)
+    assert key != completion_key("other", MESSAGES, 0.7)
+    assert key != completion_key("gpt", MESSAGES[:1] + [{"role": "user", "content": "How do I save? "}], 0.7)
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = ExactCache(ttl_seconds=300)
+    cache.put("k", "answer")
+
+    clock.now += 300
+    assert cache.get("k") == "answer"
+    clock.now += 1
+    assert cache.get("k") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 0}
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ExactCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+
+    cache.put("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_rewriting_a_key_refreshes_it(clock):
+    cache = ExactCache(max_entries=2, ttl_seconds=10)
+    cache.put("a", "old")
+    clock.now += 8
+    cache.put("a", "new")
+    cache.put("b", "2")
+    clock.now += 5
+
+    assert cache.get("a") == "new"
+    cache.put("c", "3")
+    assert cache.get("b") is None
+
+
+def test_empty_responses_are_not_cached(clock):
+    cache = ExactCache()
+    cache.put("k", "")
+
+    assert cache.get("k") is None
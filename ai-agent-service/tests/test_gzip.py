@@ -0,0 +1,39 @@
+"""
+Response compression.
+"""
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+# Enough rows to push the JSON well past the gzip minimum size
+TRANSACTIONS = [
+    {"id": i, "description": f"Coffee shop visit {i}", "amount": 4.5 + i % 7,
+     "type": "EXPENSE", "category": "Food & Dining", "date": f"2024-0{i % 9 + 1}-1{i % 9}"}
+    for i in range(60)
+]
+
+
+def test_json_responses_are_compressed():
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/patterns", json={"user_id": 1, "transactions": TRANSACTIONS},
+            headers={"Accept-Encoding": "gzip"}
+        )
+
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == "gzip"
+
+
+def test_streaming_responses_are_not_compressed():
+    with TestClient(app) as client:
+        with client.stream(
+            "POST", "/api/patterns/stream", json={"user_id": 1, "transactions": TRANSACTIONS},
+            headers={"Accept-Encoding": "gzip"}
+        ) as response:
+            lines = [line for line in response.iter_lines() if line]
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert len(lines) > 1
@@ -0,0 +1,60 @@
+"""
+NDJSON streaming of detected spending patterns.
+"""
+
+import json
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+def transactions(seed, n):
+    rng = random.Random(seed)
+    return [
+        {"id": i,
+         "description": rng.choice(["Netflix", "Spotify", "Uber ride", "Coffee", "Amazon order", "Rent"]),
+         "amount": round(rng.uniform(1, 400), 2),
+         "type": rng.choice(["EXPENSE", "EXPENSE", "INCOME"]),
+         "category": rng.choice(["Food & Dining", "Shopping", "Entertainment", None]),
+         "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"}
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("seed, n", [(0, 0), (1, 1), (2, 12), (3, 80), (4, 400)])
+def test_stream_yields_the_same_patterns_as_the_full_response(client, seed, n):
+    body = {"user_id": 1, "transactions": transactions(seed, n)}
+
+    full = client.post("/api/patterns", json=body).json()
+    with client.stream("POST", "/api/patterns/stream", json=body) as response:
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = list(response.iter_lines())
+
+    assert [json.loads(line) for line in lines if line] == full["patterns"]
+
+
+def test_every_line_is_one_complete_json_object(client):
+    body = {"user_id": 1, "transactions": transactions(5, 200)}
+
+    with client.stream("POST", "/api/patterns/stream", json=body) as response:
+        raw = response.read()
+
+    assert raw.endswith(b"\n")
+    for line in raw.split(b"\n")[:-1]:
+        assert set(json.loads(line)) == {"pattern_type", "description", "impact", "recommendation"}
+
+
+def test_invalid_body_is_rejected_before_streaming(client):
+    response = client.post("/api/patterns/stream", json={"user_id": 1, "transactions": [{"id": 1}]})
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][:3] == ["body", "transactions", 0]
@@ -0,0 +1,157 @@
+"""
+Semantic response cache, and which agent requests may use it.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.core import cache as cache_module
+from app.core.agent import FinancialAIAgent
+from app.core.cache import LLMCache
+
+
+class Clock:
+    """Stand-in for ``time`` whose ``monotonic()`` only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+def unit(*values):
+    return np.array(values, dtype=np.float32)
+
+
+def test_similar_embeddings_hit_and_dissimilar_ones_miss(clock):
+    cache = LLMCache(threshold=0.9, max_entries=4)
+    cache.put(unit(1, 0, 0), "answer")
+
+    assert cache.get(unit(0.99, 0.05, 0)) == "answer"
+    assert cache.get(unit(0, 1, 0)) is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = LLMCache(ttl_seconds=60)
+    cache.put(unit(1, 0), "answer")
+
+    clock.now += 60
+    assert cache.get(unit(1, 0)) == "answer"
+    clock.now += 1
+    assert cache.get(unit(1, 0)) is None
+
+
+def test_full_cache_replaces_the_least_recently_used_entry(clock):
+    cache = LLMCache(max_entries=2)
+    cache.put(unit(1, 0, 0), "a")
+    clock.now += 1
+    cache.put(unit(0, 1, 0), "b")
+    clock.now += 1
+    assert cache.get(unit(1, 0, 0)) == "a"
+
+    clock.now += 1
+    cache.put(unit(0, 0, 1), "c")
+
+    assert cache.get(unit(1, 0, 0)) == "a"
+    assert cache.get(unit(0, 1, 0)) is None
+    assert cache.get(unit(0, 0, 1)) == "c"
+
+
+def test_full_cache_replaces_expired_entries_first(clock):
+    cache = LLMCache(max_entries=2, ttl_seconds=10)
+    cache.put(unit(1, 0, 0), "old")
+    clock.now += 8
+    cache.put(unit(0, 1, 0), "recent")
+    clock.now += 1
+    assert cache.get(unit(1, 0, 0)) == "old"
+
+    # "old" is now the most recently used, but it has expired
+    clock.now += 2
+    cache.put(unit(0, 0, 1), "new")
+
+    assert cache.get(unit(0, 1, 0)) == "recent"
+    assert cache.get(unit(0, 0, 1)) == "new"
+
+
+def test_unusable_embeddings_are_not_stored(clock):
+    cache = LLMCache()
+    cache.put(None, "answer")
+    cache.put(unit(0, 0), "answer")
+
+    assert cache.stats()["entries"] == 0
+    assert cache.get(None) is None
+
+
+class FakeOpenAI:
+    """Records calls; every text embeds to the same vector, so any two are 'similar'."""
+
+    def __init__(self):
+        self.completions = []
+        self.embeddings_calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._complete))
+        self.embeddings = SimpleNamespace(create=self._embed)
+
+    async def _complete(self, **kwargs):
+        self.completions.append(kwargs)
+        answer = f"answer {len(self.completions)}"
+
+        async def stream():
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=answer))])
+
+        return stream()
+
+    async def _embed(self, **kwargs):
+        self.embeddings_calls.append(kwargs["input"])
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[1.0, 0.0, 0.0])])
+
+
+@pytest.fixture
+def agent():
+    agent = FinancialAIAgent()
+    agent.client = FakeOpenAI()
+    agent.openai_available = True
+    return agent
+
+
+def test_chat_without_context_reuses_similar_answers(agent):
+    first = asyncio.run(agent.chat("How do I save money?", {}))
+    second = asyncio.run(agent.chat("How can I save some money?", {}))
+
+    assert first == second == "answer 1"
+    assert len(agent.client.completions) == 1
+    # Only the message is embedded
+    assert agent.client.embeddings_calls == ["How do I save money?", "How can I save some money?"]
+
+
+def test_chat_with_context_never_uses_the_semantic_cache(agent):
+    asyncio.run(agent.chat("How do I save money?", {}))
+    with_context = asyncio.run(agent.chat("How do I save money?", {"monthlyIncome": 4000}))
+    other_user = asyncio.run(agent.chat("How do I save money?", {"monthlyIncome": 9000}))
+
+    assert with_context == "answer 2"
+    assert other_user == "answer 3"
+    assert agent.client.embeddings_calls == ["How do I save money?"]
+
+
+def test_advice_is_only_reused_for_identical_figures(agent):
+    data = {"totalBalance": 1000, "monthlyIncome": 4000, "monthlyExpenses": 3000, "monthlySavings": 1000}
+
+    first = asyncio.run(agent.get_advice(data))
+    repeat = asyncio.run(agent.get_advice(dict(data)))
+    other = asyncio.run(agent.get_advice({**data, "monthlyExpenses": 3500}))
+
+    assert first == repeat == "answer 1"
+    assert other == "answer 2"
+    assert agent.client.embeddings_calls == []
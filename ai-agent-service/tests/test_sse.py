@@ -0,0 +1,88 @@
+"""
+Server-Sent Events framing of streamed replies.
+"""
+
+import json
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.chat import generate_suggestions
+from app.core.agent import to_sse
+from main import app
+
+
+def parse_sse(stream):
+    """Minimal SSE parser following the WHATWG event-stream rules."""
+    events, event, data = [], None, []
+    for line in re.split(r"\r\n|\r|\n", stream):
+        if line == "":
+            if data:
+                events.append((event or "message", "\n".join(data)))
+            event, data = None, []
+            continue
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "event":
+            event = value
+        elif field == "data":
+            data.append(value)
+    return events
+
+
+@pytest.mark.parametrize("token", [
+    "Hello",
+    " leading space",
+    "two\nlines",
+    "trailing newline\n",
+    "\n\nblank lines\n\n",
+    "data: looks like a field",
+    "colon: inside",
+])
+def test_tokens_round_trip(token):
+    assert parse_sse(to_sse(token)) == [("message", token)]
+
+
+@pytest.mark.parametrize("token, received", [
+    ("crlf\r\nline", "crlf\nline"),
+    ("bare\rreturn", "bare\nreturn"),
+])
+def test_carriage_returns_become_line_breaks_without_losing_text(token, received):
+    assert parse_sse(to_sse(token)) == [("message", received)]
+
+
+def test_named_events():
+    assert to_sse("[DONE]", event="done") == "event: done\ndata: [DONE]\n\n"
+    assert parse_sse(to_sse('["a", "b"]', event="suggestions")) == [("suggestions", '["a", "b"]')]
+
+
+def test_consecutive_messages_stay_separate():
+    stream = to_sse("one") + to_sse("two\nthree") + to_sse("x", event="done")
+
+    assert parse_sse(stream) == [("message", "one"), ("message", "two\nthree"), ("done", "x")]
+
+
+def test_chat_stream_endpoint_frames_reply_and_suggestions():
+    message = "How do I save money?"
+    with TestClient(app) as client:
+        app.state.agent.openai_available = False
+        response = client.post("/api/chat/stream", json={"user_id": 1, "message": message, "context": {}})
+        expected_reply = app.state.agent._rule_based_chat(message, {})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(response.text)
+    assert events[0] == ("message", expected_reply)
+    assert events[-1] == ("suggestions", json.dumps(generate_suggestions(message)))
+
+
+def test_advice_stream_endpoint_ends_with_done():
+    data = {"totalBalance": 100, "monthlyIncome": 4000, "monthlyExpenses": 3000}
+    with TestClient(app) as client:
+        app.state.agent.openai_available = False
+        response = client.post("/api/advice/stream", json={"user_id": 1, "financial_data": data})
+
+    events = parse_sse(response.text)
+    assert len(events) >= 2
+    assert events[-1] == ("done", "[DONE]")
@@ -3,16 +3,24 @@ Spending analysis endpoint.
 Provides detailed breakdown of spending patterns and insights.
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
 from typing import List, Dict
+import numpy as np
 
 from app.core.models import Transaction
 from app.core.utils import (
-    transactions_to_dataframe,
+    transactions_to_arrays,
+    transactions_to_soa,
     round_currency,
-    calculate_percentage,
-    get_empty_analysis_result
+    get_empty_analysis_result,
+    group_sum_count,
+    month_groups,
+    month_labels,
+    decode_transactions_request,
+    request_body_schema,
+    validate_request_body
 )
 
 
@@ -58,6 +66,10 @@ class AnalyzeResponse(BaseModel):
     insights: List[str]
 
 
+# Type axis of the aggregate cube
+EXPENSE, INCOME, OTHER = 0, 1, 2
+
+
 def analyze_transactions(transactions: List[Transaction]) -> dict:
     """
     Perform comprehensive analysis on transactions.
@@ -71,25 +83,43 @@ def analyze_transactions(transactions: List[Transaction]) -> dict:
     if not transactions:
         return get_empty_analysis_result()
     
-    df = transactions_to_dataframe(transactions)
+    return analyze_arrays(transactions_to_arrays(transactions))
+
+
+def analyze_arrays(data: Dict[str, np.ndarray]) -> dict:
+    """
+    Perform comprehensive analysis on ``transactions_to_arrays`` columns.
+    
+    Args:
+        data: Column arrays of the transactions to analyze
+        
+    Returns:
+        Dictionary containing analysis results
+    """
+    n_transactions = int(data['amount'].size)
+    if n_transactions == 0:
+        return get_empty_analysis_result()
+    
+    is_income = data['type'] == 'INCOME'
+    is_expense = data['type'] == 'EXPENSE'
+    cube = _aggregate(data, is_income, is_expense)
     
     # Basic totals
-    total_income = df[df['type'] == 'INCOME']['amount'].sum()
-    total_expenses = df[df['type'] == 'EXPENSE']['amount'].sum()
+    total_income = cube['sums'][:, INCOME].sum()
+    total_expenses = cube['sums'][:, EXPENSE].sum()
     net_balance = total_income - total_expenses
     
     # Category breakdown
-    expenses_df = df[df['type'] == 'EXPENSE']
-    category_breakdown = _calculate_category_breakdown(expenses_df)
+    category_breakdown = _calculate_category_breakdown(cube)
     
     # Monthly breakdown
-    monthly_breakdown = _calculate_monthly_breakdown(df, expenses_df)
+    monthly_breakdown = _calculate_monthly_breakdown(cube)
     
     # Top spending categories
     top_categories = [cb['category'] for cb in category_breakdown[:5]]
     
     # Detect unusual transactions
-    unusual_transactions = _detect_unusual_transactions(expenses_df)
+    unusual_transactions = _detect_unusual_transactions(data, is_expense)
     
     # Generate insights
     insights = _generate_insights(
@@ -98,7 +128,7 @@ def analyze_transactions(transactions: List[Transaction]) -> dict:
     )
     
     return {
-        "total_transactions": len(transactions),
+        "total_transactions": n_transactions,
         "total_income": round_currency(total_income),
         "total_expenses": round_currency(total_expenses),
         "net_balance": round_currency(net_balance),
@@ -110,72 +140,122 @@ def analyze_transactions(transactions: List[Transaction]) -> dict:
     }
 
 
-def _calculate_category_breakdown(expenses_df) -> List[dict]:
+def _aggregate(data: Dict[str, np.ndarray], is_income: np.ndarray,
+               is_expense: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Sum and count amounts per (month, type, category) in a single pass.
+    
+    Every breakdown in the analysis is a reduction of this small dense
+    cube, so the transactions themselves are scanned only once.
+    
+    Returns:
+        Dict with sorted "months" and "categories" labels, plus "sums" and
+        "counts" arrays of shape (months, 3, categories)
+    """
+    months, month_idx = month_groups(data)
+    
+    # Category ids already follow name order, so the axis stays alphabetical
+    categories, category_idx = data['category_names'], data['category_idx']
+    type_idx = np.where(is_expense, EXPENSE, np.where(is_income, INCOME, OTHER))
+    
+    shape = (months.size, 3, categories.size)
+    keys = np.ravel_multi_index((month_idx, type_idx, category_idx), shape)
+    sums, counts = group_sum_count(keys, data['amount'], months.size * 3 * categories.size)
+    
+    return {
+        "months": month_labels(months),
+        "categories": categories,
+        "sums": sums.reshape(shape),
+        "counts": counts.reshape(shape)
+    }
+
+
+def _calculate_category_breakdown(cube: Dict[str, np.ndarray]) -> List[dict]:
     """Calculate spending breakdown by category."""
-    if expenses_df.empty:
+    counts = cube['counts'][:, EXPENSE].sum(axis=0)
+    present = counts > 0
+    if not present.any():
         return []
     
-    stats = expenses_df.groupby('category').agg({
-        'amount': ['sum', 'count', 'mean']
-    }).reset_index()
-    stats.columns = ['category', 'total_spent', 'transaction_count', 'average_transaction']
+    categories = cube['categories'][present]
+    totals = cube['sums'][:, EXPENSE].sum(axis=0)[present]
+    counts = counts[present]
+    averages = totals / counts
     
-    total_spent = stats['total_spent'].sum()
+    total_spent = totals.sum()
+    percentages = totals / total_spent * 100 if total_spent > 0 else np.zeros_like(totals)
     
+    # Every column is computed up front; rows are only zipped together here
     breakdown = [{
-        "category": row['category'],
-        "total_spent": round_currency(row['total_spent']),
-        "transaction_count": int(row['transaction_count']),
-        "average_transaction": round_currency(row['average_transaction']),
-        "percentage_of_total": calculate_percentage(row['total_spent'], total_spent),
+        "category": category,
+        "total_spent": round_currency(total),
+        "transaction_count": count,
+        "average_transaction": round_currency(average),
+        "percentage_of_total": round_currency(percentage),
         "trend": "stable"
-    } for _, row in stats.iterrows()]
+    } for category, total, count, average, percentage in zip(
+        categories, totals, counts.tolist(), averages, percentages
+    )]
     
     return sorted(breakdown, key=lambda x: x['total_spent'], reverse=True)
 
 
-def _calculate_monthly_breakdown(df, expenses_df) -> List[dict]:
+def _calculate_monthly_breakdown(cube: Dict[str, np.ndarray]) -> List[dict]:
     """Calculate monthly spending and income breakdown."""
-    monthly_data = df.groupby(['month', 'type'])['amount'].sum().unstack(fill_value=0)
-    
-    breakdown = []
-    for month in monthly_data.index:
-        month_expenses = expenses_df[expenses_df['month'] == month]
-        top_cat = "N/A"
-        if not month_expenses.empty:
-            top_cat = month_expenses.groupby('category')['amount'].sum().idxmax()
-        
-        income = float(monthly_data.loc[month, 'INCOME']) if 'INCOME' in monthly_data.columns else 0
-        spending = float(monthly_data.loc[month, 'EXPENSE']) if 'EXPENSE' in monthly_data.columns else 0
-        
-        breakdown.append({
-            "month": str(month),
-            "total_spending": round_currency(spending),
-            "total_income": round_currency(income),
-            "net_savings": round_currency(income - spending),
-            "top_category": top_cat
-        })
+    spending = cube['sums'][:, EXPENSE].sum(axis=1)
+    income = cube['sums'][:, INCOME].sum(axis=1)
     
-    return breakdown
+    # Top category per month in one argmax over the month x category grid.
+    # Only categories with expenses that month compete; ties go to the first name.
+    present = cube['counts'][:, EXPENSE] > 0
+    month_totals = np.where(present, cube['sums'][:, EXPENSE], -np.inf)
+    top_categories = np.where(
+        present.any(axis=1), cube['categories'][np.argmax(month_totals, axis=1)], "N/A"
+    )
+    
+    return [{
+        "month": month,
+        "total_spending": round_currency(month_spending),
+        "total_income": round_currency(month_income),
+        "net_savings": round_currency(month_income - month_spending),
+        "top_category": top_cat
+    } for month, month_spending, month_income, top_cat in zip(
+        cube['months'], spending, income, top_categories
+    )]
 
 
-def _detect_unusual_transactions(expenses_df) -> List[dict]:
-    """Detect unusually large transactions using statistical analysis."""
-    if len(expenses_df) <= 5:
+def _detect_unusual_transactions(data: Dict[str, np.ndarray], is_expense: np.ndarray) -> List[dict]:
+    """
+    Detect unusually large transactions using statistical analysis.
+    
+    Only the expense amounts are gathered; ids and descriptions are read
+    from the full arrays at the outlier positions alone.
+    """
+    amounts = data['amount'][is_expense]
+    if amounts.size <= 5:
         return []
     
-    mean_expense = expenses_df['amount'].mean()
-    std_expense = expenses_df['amount'].std()
-    threshold = mean_expense + 2 * std_expense
+    mean_expense = amounts.mean()
+    std_expense = amounts.std(ddof=1)
+    if std_expense == 0:
+        return []
     
-    outliers = expenses_df[expenses_df['amount'] > threshold]
+    # Flag expenses more than two (sample) standard deviations above the mean
+    z_scores = (amounts - mean_expense) / std_expense
+    flagged = np.flatnonzero(z_scores > 2)
+    outliers = np.flatnonzero(is_expense)[flagged]
+    outlier_amounts = amounts[flagged]
+    ratios = outlier_amounts / mean_expense
     
     return [{
-        "id": row['id'],
-        "description": row['description'],
-        "amount": round_currency(row['amount']),
-        "reason": f"Amount is {round(row['amount']/mean_expense, 1)}x your average expense"
-    } for _, row in outliers.iterrows()]
+        "id": id_,
+        "description": description,
+        "amount": round_currency(amount),
+        "reason": f"Amount is {round(ratio, 1)}x your average expense"
+    } for id_, description, amount, ratio in zip(
+        data['id'][outliers].tolist(), data['description'][outliers],
+        outlier_amounts, ratios.tolist()
+    )]
 
 
 def _generate_insights(category_breakdown, total_income, net_balance,
@@ -213,48 +293,86 @@ def _generate_insights(category_breakdown, total_income, net_balance,
     return insights
 
 
-@router.post("/analyze", response_model=AnalyzeResponse)
-async def analyze_spending(request: AnalyzeRequest):
+ANALYZE_REQUEST = TypeAdapter(AnalyzeRequest)
+
+
+def _latest_indices(timestamps: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the k latest timestamps, newest first, in O(n).
+    
+    Ties keep their original order, matching ``DataFrame.nlargest``.
+    
+    Args:
+        timestamps: Integer timestamps (e.g. datetime64 viewed as int64)
+        k: Number of positions to return
+        
+    Returns:
+        Array of at most k positions
+    """
+    if timestamps.size <= k:
+        candidates = np.arange(timestamps.size)
+    else:
+        # Partition to find the k-th latest value, then keep every position
+        # at or above it so ties at the boundary are resolved by position
+        kth = timestamps[np.argpartition(timestamps, timestamps.size - k)[timestamps.size - k]]
+        candidates = np.flatnonzero(timestamps >= kth)
+    
+    order = np.argsort(-timestamps[candidates], kind="stable")
+    return candidates[order[:k]]
+
+
+@router.post(
+    "/analyze",
+    responses={200: {"model": AnalyzeResponse}},
+    openapi_extra=request_body_schema(AnalyzeRequest)
+)
+async def analyze_spending(request: Request):
     """
     Perform comprehensive analysis on user's transactions.
     
     Provides category breakdown, monthly trends, and actionable insights.
     """
-    result = analyze_transactions(request.transactions)
-    
-    return AnalyzeResponse(
-        user_id=request.user_id,
-        total_transactions=result["total_transactions"],
-        total_income=result["total_income"],
-        total_expenses=result["total_expenses"],
-        net_balance=result["net_balance"],
-        category_breakdown=[CategoryBreakdown(**cb) for cb in result["category_breakdown"]],
-        monthly_breakdown=[MonthlyBreakdown(**mb) for mb in result["monthly_breakdown"]],
-        top_spending_categories=result["top_spending_categories"],
-        unusual_transactions=result["unusual_transactions"],
-        insights=result["insights"]
-    )
+    decoded = decode_transactions_request(await request.body(), {"user_id": None})
+    if decoded is None:
+        # Slow path: full validation, which also reports any errors
+        body = await validate_request_body(request, ANALYZE_REQUEST)
+        decoded = ({"user_id": body.user_id}, transactions_to_arrays(body.transactions))
+    
+    fields, data = decoded
+    result = analyze_arrays(data)
+    
+    # The result already has the response shape; serialize it once, unvalidated
+    return ORJSONResponse(content={"user_id": fields["user_id"], **result})
 
 
 @router.post("/analyze/category/{category}")
 async def analyze_category(category: str, request: AnalyzeRequest):
     """Get detailed analysis for a specific spending category."""
-    transactions = [t for t in request.transactions if t.category == category]
+    in_category = np.fromiter(
+        (t.category == category for t in request.transactions), dtype=bool, count=len(request.transactions)
+    )
     
-    if not transactions:
+    if not in_category.any():
         raise HTTPException(status_code=404, detail=f"No transactions found for category: {category}")
     
-    df = transactions_to_dataframe(transactions)
+    # Filter the (cached) columns rather than re-parsing a filtered list,
+    # copying only the columns used below
+    data = transactions_to_soa(request.transactions)
+    amounts = data['amount'][in_category]
+    dates = data['date'][in_category]
+    recent = _latest_indices(data['timestamp'][in_category].view(np.int64), 5)
     
-    return {
+    return ORJSONResponse(content={
         "category": category,
-        "total_spent": round_currency(df['amount'].sum()),
-        "transaction_count": len(df),
-        "average_transaction": round_currency(df['amount'].mean()),
-        "min_transaction": round_currency(df['amount'].min()),
-        "max_transaction": round_currency(df['amount'].max()),
+        "total_spent": round_currency(amounts.sum()),
+        "transaction_count": int(amounts.size),
+        "average_transaction": round_currency(amounts.mean()),
+        "min_transaction": round_currency(amounts.min()),
+        "max_transaction": round_currency(amounts.max()),
         "recent_transactions": [
-            {"description": row['description'], "amount": round_currency(row['amount']), "date": str(row['date'])}
-            for _, row in df.nlargest(5, 'date').iterrows()
+            {"description": description, "amount": round_currency(amount), "date": str(date)}
+            for description, amount, date in zip(
+                data['description'][in_category][recent], amounts[recent].tolist(), dates[recent].tolist()
+            )
         ]
-    }
+    })
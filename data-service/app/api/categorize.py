@@ -5,8 +5,9 @@ Uses keyword matching and simple NLP to categorize transactions.
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
+from bisect import bisect_right
+from itertools import accumulate
 from typing import Optional
-import re
 
 from app.core.config import settings
 
@@ -27,6 +28,55 @@ class CategorizeResponse(BaseModel):
     matched_keywords: list[str]
 
 
+# Keyword matcher data, built once at startup. Keywords match as plain
+# substrings, by the automaton or directly when it is unavailable.
+KEYWORD_PAIRS = settings.keyword_pairs
+KEYWORD_AUTOMATON = settings.keyword_automaton
+
+# Confidence by number of matched keywords; three or more share the last entry
+CONFIDENCE_BY_MATCHES = (0.0, 0.7, 0.85, 0.95)
+
+
+def _group_hits(hits: set) -> dict[str, list[str]]:
+    """Group automaton hits by category, keeping keywords in configuration order."""
+    matches = {}
+    for category, _, keyword in sorted(hits, key=lambda hit: hit[1]):
+        matches.setdefault(category, []).append(keyword)
+    return matches
+
+
+def _match_keywords(description_lower: str) -> dict[str, list[str]]:
+    """Return the matched keywords per category, in configuration order."""
+    if KEYWORD_AUTOMATON is None:
+        matches = {}
+        for word, category, keyword in KEYWORD_PAIRS:
+            if word in description_lower:
+                matches.setdefault(category, []).append(keyword)
+        return matches
+    
+    # A keyword can occur several times in one description; count it once
+    return _group_hits(
+        {owner for _, owners in KEYWORD_AUTOMATON.iter(description_lower) for owner in owners}
+    )
+
+
+def _pick_category(matches_by_category: dict[str, list[str]]) -> tuple[str, float, list[str]]:
+    """Choose the category with the most matched keywords and score it."""
+    best_category = "Uncategorized"
+    best_score = 0
+    matched_keywords = []
+    
+    for category in settings.CATEGORY_KEYWORDS:
+        matches = matches_by_category.get(category, [])
+        if len(matches) > best_score:
+            best_score = len(matches)
+            best_category = category
+            matched_keywords = matches
+    
+    confidence = CONFIDENCE_BY_MATCHES[min(best_score, len(CONFIDENCE_BY_MATCHES) - 1)]
+    return best_category, confidence, matched_keywords
+
+
 def categorize_transaction(description: str) -> tuple[str, float, list[str]]:
     """
     Categorize a transaction based on its description.
@@ -37,36 +87,35 @@ def categorize_transaction(description: str) -> tuple[str, float, list[str]]:
     Returns:
         Tuple of (category, confidence, matched_keywords)
     """
-    description_lower = description.lower()
+    return _pick_category(_match_keywords(description.lower()))
+
+
+def categorize_transactions(descriptions: list[str]) -> list[tuple[str, float, list[str]]]:
+    """
+    Categorize many transactions with a single automaton scan.
     
-    best_category = "Uncategorized"
-    best_score = 0
-    matched_keywords = []
+    The lowercased descriptions are joined with NUL separators, which no
+    keyword contains, so one pass over the joined text finds every match
+    and each match's end offset identifies its description.
     
-    for category, keywords in settings.CATEGORY_KEYWORDS.items():
-        matches = []
-        for keyword in keywords:
-            # Use word boundary matching for better accuracy
-            pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-            if re.search(pattern, description_lower) or keyword.lower() in description_lower:
-                matches.append(keyword)
+    Args:
+        descriptions: Transaction description texts
         
-        if len(matches) > best_score:
-            best_score = len(matches)
-            best_category = category
-            matched_keywords = matches
+    Returns:
+        One (category, confidence, matched_keywords) tuple per description
+    """
+    if KEYWORD_AUTOMATON is None:
+        return [categorize_transaction(description) for description in descriptions]
     
-    # Calculate confidence based on number of matches
-    if best_score == 0:
-        confidence = 0.0
-    elif best_score == 1:
-        confidence = 0.7
-    elif best_score == 2:
-        confidence = 0.85
-    else:
-        confidence = 0.95
+    lowered = [description.lower() for description in descriptions]
+    # ends[i] is the offset just past the separator following description i
+    ends = list(accumulate(len(text) + 1 for text in lowered))
     
-    return best_category, confidence, matched_keywords
+    hits = [set() for _ in lowered]
+    for end, owners in KEYWORD_AUTOMATON.iter("\0".join(lowered)):
+        hits[bisect_right(ends, end)].update(owners)
+    
+    return [_pick_category(_group_hits(description_hits)) for description_hits in hits]
 
 
 @router.post("/categorize", response_model=CategorizeResponse)
@@ -101,14 +150,12 @@ async def categorize_batch(descriptions: list[str]):
     Returns:
         List of categorization results
     """
-    results = []
-    for desc in descriptions:
-        category, confidence, keywords = categorize_transaction(desc)
-        results.append({
-            "description": desc,
-            "category": category,
-            "confidence": confidence,
-            "matched_keywords": keywords
-        })
+    categorized = categorize_transactions(descriptions)
+    results = [{
+        "description": desc,
+        "category": category,
+        "confidence": confidence,
+        "matched_keywords": keywords
+    } for desc, (category, confidence, keywords) in zip(descriptions, categorized)]
     
     return {"results": results}
@@ -1,17 +1,35 @@
 """
 Spending forecast endpoint.
-Uses linear regression to predict future spending patterns.
+Uses least-squares linear regression to predict future spending patterns.
 """
 
-from fastapi import APIRouter
-from pydantic import BaseModel
-from typing import List
-from datetime import datetime, timedelta
+import hashlib
+import math
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from fastapi import APIRouter, Request
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, TypeAdapter
+from typing import Dict, List
+from datetime import datetime
 import numpy as np
-from sklearn.linear_model import LinearRegression
 
+from app.core.config import settings
 from app.core.models import Transaction
-from app.core.utils import transactions_to_dataframe, round_currency, calculate_percentage
+from app.core.forecast_core import compute_forecast
+from app.core.utils import (
+    transactions_to_arrays,
+    decode_transactions_request,
+    group_sum_count,
+    month_groups,
+    round_currency,
+    round_currency_array,
+    calculate_percentage,
+    request_body_schema,
+    validate_json_body
+)
 
 
 router = APIRouter()
@@ -57,23 +75,55 @@ def _get_empty_forecast(months: int) -> dict:
     }
 
 
+def _monthly_totals(data: Dict[str, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sum expenses and income per month in a single pass.
+    
+    Each series is in month order and skips months without transactions
+    of that type.
+    
+    Returns:
+        Tuple of (monthly_spending, monthly_income) arrays
+    """
+    is_expense = data['type'] == 'EXPENSE'
+    is_income = data['type'] == 'INCOME'
+    selected = is_expense | is_income
+    months, month_idx = month_groups(data)
+    
+    # (month, type) grid over the distinct months: column 0 holds expenses,
+    # column 1 income
+    keys = month_idx[selected] * 2 + is_income[selected]
+    sums, counts = group_sum_count(keys, data['amount'][selected], months.size * 2)
+    sums = sums.reshape(months.size, 2)
+    counts = counts.reshape(months.size, 2)
+    return sums[counts[:, 0] > 0, 0], sums[counts[:, 1] > 0, 1]
+
+
+def _future_month_labels(months: int) -> List[str]:
+    """
+    Label the forecast months as "YYYY-MM" strings in one vectorized step.
+    
+    Forecast month i (1-based) is the i-th calendar month after the
+    current one.
+    """
+    current = np.datetime64(datetime.now(), 'M')
+    return (current + np.arange(1, months + 1)).astype(str).tolist()
+
+
 def _generate_simple_forecast(monthly_spending, monthly_income, months: int) -> dict:
     """Generate simple forecast when insufficient data for regression."""
     avg_spending = monthly_spending.mean() if len(monthly_spending) > 0 else 0
     avg_income = monthly_income.mean() if len(monthly_income) > 0 else 0
     
-    forecasts = []
-    current_date = datetime.now()
-    for i in range(months):
-        future_date = current_date + timedelta(days=30 * (i + 1))
-        forecasts.append({
-            "month": future_date.strftime("%Y-%m"),
-            "predicted_spending": round_currency(avg_spending),
-            "predicted_income": round_currency(avg_income),
-            "predicted_savings": round_currency(avg_income - avg_spending),
-            "confidence_lower": round_currency(avg_spending * 0.8),
-            "confidence_upper": round_currency(avg_spending * 1.2)
-        })
+    # Every forecast month is the same, so round each value once
+    row = {
+        "predicted_spending": round_currency(avg_spending),
+        "predicted_income": round_currency(avg_income),
+        "predicted_savings": round_currency(avg_income - avg_spending),
+        "confidence_lower": round_currency(avg_spending * 0.8),
+        "confidence_upper": round_currency(avg_spending * 1.2)
+    }
+    forecasts = [{"month": month, **row} for month in _future_month_labels(months)]
     
     return {
         "forecasts": forecasts,
@@ -85,26 +135,44 @@ def _generate_simple_forecast(monthly_spending, monthly_income, months: int) ->
     }
 
 
-def _determine_trend(slope: float) -> str:
-    """Determine spending trend based on regression slope."""
-    if slope > 50:
-        return "increasing"
-    elif slope < -50:
-        return "decreasing"
-    return "stable"
+# Regression slopes beyond +/- this amount per month count as a trend
+TREND_SLOPE_THRESHOLD = 50
+
+TREND_LABELS = ("decreasing", "stable", "increasing")
+
+# Savings-rate brackets: below 10%, below 20%, and 20% or more
+SAVINGS_RATE_THRESHOLDS = (10, 20)
+
+_LOW_SAVINGS_ADVICE = (
+    "Your savings rate is low. Consider cutting back on discretionary spending to build your emergency fund."
+)
+_DECENT_SAVINGS_ADVICE = (
+    "You're saving a decent amount. Try to increase it to 20% for better financial security."
+)
 
+# Advice per savings-rate bracket (rows) and trend (columns, as in TREND_LABELS)
+FORECAST_ADVICE = (
+    (_LOW_SAVINGS_ADVICE,) * 3,
+    (_DECENT_SAVINGS_ADVICE,) * 3,
+    (
+        "Great job! Your spending is decreasing. Keep up the good financial habits.",
+        "Your finances look stable. Consider investing your extra savings for long-term growth.",
+        "Your spending is trending upward. Review your recent expenses to identify areas to cut back."
+    )
+)
+
+
+def _determine_trend(slope: float) -> int:
+    """Index into TREND_LABELS for a regression slope; the thresholds themselves are stable."""
+    if math.isnan(slope):
+        # No usable slope (e.g. non-finite amounts) reads as stable
+        return 1
+    return int(slope >= -TREND_SLOPE_THRESHOLD) + int(slope > TREND_SLOPE_THRESHOLD)
 
-def _generate_advice(savings_rate: float, trend: str) -> str:
-    """Generate financial advice based on analysis."""
-    if savings_rate < 10:
-        return "Your savings rate is low. Consider cutting back on discretionary spending to build your emergency fund."
-    elif savings_rate < 20:
-        return "You're saving a decent amount. Try to increase it to 20% for better financial security."
-    elif trend == "increasing":
-        return "Your spending is trending upward. Review your recent expenses to identify areas to cut back."
-    elif trend == "decreasing":
-        return "Great job! Your spending is decreasing. Keep up the good financial habits."
-    return "Your finances look stable. Consider investing your extra savings for long-term growth."
+
+def _generate_advice(savings_rate: float, trend: int) -> str:
+    """Generate financial advice from the savings rate and a TREND_LABELS index."""
+    return FORECAST_ADVICE[bisect_right(SAVINGS_RATE_THRESHOLDS, savings_rate)][trend]
 
 
 def calculate_forecast(transactions: List[Transaction], months: int = 6) -> dict:
@@ -121,72 +189,158 @@ def calculate_forecast(transactions: List[Transaction], months: int = 6) -> dict
     if not transactions:
         return _get_empty_forecast(months)
     
-    df = transactions_to_dataframe(transactions)
+    return forecast_from_arrays(transactions_to_arrays(transactions), months)
+
+
+def forecast_from_arrays(data: Dict[str, np.ndarray], months: int = 6) -> dict:
+    """
+    Calculate spending forecast from ``transactions_to_arrays`` columns.
+    
+    Args:
+        data: Column arrays of the historical transactions
+        months: Number of months to forecast
+        
+    Returns:
+        Dictionary containing forecast data
+    """
+    if data['amount'].size == 0:
+        return _get_empty_forecast(months)
     
     # Aggregate by month
-    monthly_spending = df[df['type'] == 'EXPENSE'].groupby('month')['amount'].sum()
-    monthly_income = df[df['type'] == 'INCOME'].groupby('month')['amount'].sum()
+    monthly_spending, monthly_income = _monthly_totals(data)
     
     # Need at least 2 data points for regression
     if len(monthly_spending) < 2:
         return _generate_simple_forecast(monthly_spending, monthly_income, months)
     
-    # Fit linear regression for spending
-    X = np.array(range(len(monthly_spending))).reshape(-1, 1)
-    y_spending = monthly_spending.values
-    
-    model = LinearRegression()
-    model.fit(X, y_spending)
-    
-    trend = _determine_trend(model.coef_[0])
-    avg_income = float(monthly_income.mean()) if len(monthly_income) > 0 else 0
-    std_dev = monthly_spending.std() if len(monthly_spending) > 1 else 0
+    predictions, lower, upper, slope, avg_spending, avg_income = compute_forecast(
+        monthly_spending, monthly_income, months
+    )
+    trend = _determine_trend(slope)
+    savings = avg_income - predictions
+    predicted_income = round_currency(avg_income)
     
-    # Generate forecasts
-    forecasts = []
-    current_date = datetime.now()
+    # Generate forecasts; every column is computed and rounded up front,
+    # rows only zip the resulting floats
+    forecasts = [{
+        "month": month,
+        "predicted_spending": predicted_spending,
+        "predicted_income": predicted_income,
+        "predicted_savings": predicted_savings,
+        "confidence_lower": low,
+        "confidence_upper": high
+    } for month, predicted_spending, predicted_savings, low, high in zip(
+        _future_month_labels(months),
+        *(round_currency_array(column).tolist() for column in (predictions, savings, lower, upper))
+    )]
     
-    for i in range(months):
-        future_X = np.array([[len(monthly_spending) + i]])
-        predicted_spending = max(0, model.predict(future_X)[0])
-        future_date = current_date + timedelta(days=30 * (i + 1))
-        
-        forecasts.append({
-            "month": future_date.strftime("%Y-%m"),
-            "predicted_spending": round_currency(predicted_spending),
-            "predicted_income": round_currency(avg_income),
-            "predicted_savings": round_currency(avg_income - predicted_spending),
-            "confidence_lower": round_currency(max(0, predicted_spending - 1.96 * std_dev)),
-            "confidence_upper": round_currency(predicted_spending + 1.96 * std_dev)
-        })
-    
-    avg_spending = float(monthly_spending.mean())
     savings_rate = calculate_percentage(avg_income - avg_spending, avg_income)
     
     return {
         "forecasts": forecasts,
         "average_monthly_spending": round_currency(avg_spending),
         "average_monthly_income": round_currency(avg_income),
-        "spending_trend": trend,
+        "spending_trend": TREND_LABELS[trend],
         "savings_rate": savings_rate,
         "advice": _generate_advice(savings_rate, trend)
     }
 
 
-@router.post("/forecast", response_model=ForecastResponse)
-async def get_forecast(request: ForecastRequest):
+FORECAST_REQUEST = TypeAdapter(ForecastRequest)
+
+# Recent forecasts by request hash, least recently used first, so a replayed
+# payload skips the computation
+FORECAST_CACHE_SIZE = 256
+_FORECAST_CACHE: "OrderedDict[str, dict]" = OrderedDict()
+_FORECAST_CACHE_LOCK = threading.Lock()
+
+
+def forecast_request_hash(data: Dict[str, np.ndarray], months: int) -> str:
+    """
+    Return a SHA-256 digest of everything a forecast depends on.
+    
+    That is each transaction's amount, month and type, the horizon, and
+    the current month (the forecast months are counted from it).
+    """
+    current = np.datetime64(datetime.now(), 'M')
+    digest = hashlib.sha256(f"{months}:{current}".encode())
+    for values in (data['amount'], data['month'], data['type'] == 'EXPENSE', data['type'] == 'INCOME'):
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+def cached_forecast(data: Dict[str, np.ndarray], months: int) -> dict:
+    """
+    ``forecast_from_arrays`` behind an LRU cache keyed by request hash.
+    
+    Safe to call from worker threads. Callers must not modify the returned
+    result.
+    
+    Args:
+        data: Column arrays of the historical transactions
+        months: Number of months to forecast
+        
+    Returns:
+        Dictionary containing forecast data
+    """
+    request_hash = forecast_request_hash(data, months)
+    with _FORECAST_CACHE_LOCK:
+        result = _FORECAST_CACHE.get(request_hash)
+        if result is not None:
+            _FORECAST_CACHE.move_to_end(request_hash)
+    hit = result is not None
+    if not hit:
+        result = forecast_from_arrays(data, months)
+        with _FORECAST_CACHE_LOCK:
+            _FORECAST_CACHE[request_hash] = result
+            while len(_FORECAST_CACHE) > FORECAST_CACHE_SIZE:
+                _FORECAST_CACHE.popitem(last=False)
+    
+    if settings.DEBUG:
+        print(f"Forecast request_hash={request_hash[:16]} cache={'hit' if hit else 'miss'}")
+    return result
+
+
+def forecast_from_body(body: bytes) -> dict:
+    """
+    Decode, validate and forecast a raw ``/forecast`` request body.
+    
+    This is all of the endpoint's CPU-bound work, so it runs off the event
+    loop as a single call.
+    
+    Args:
+        body: Raw JSON request body
+        
+    Returns:
+        Response content, including the requesting user_id
+        
+    Raises:
+        RequestValidationError: If the body is malformed or fails validation
+    """
+    decoded = decode_transactions_request(body, {"user_id": None, "forecast_months": 6})
+    if decoded is None:
+        # Slow path: full validation, which also reports any errors
+        request = validate_json_body(body, FORECAST_REQUEST)
+        decoded = (
+            {"user_id": request.user_id, "forecast_months": request.forecast_months},
+            transactions_to_arrays(request.transactions)
+        )
+    
+    fields, data = decoded
+    return {"user_id": fields["user_id"], **cached_forecast(data, fields["forecast_months"])}
+
+
+@router.post(
+    "/forecast",
+    responses={200: {"model": ForecastResponse}},
+    openapi_extra=request_body_schema(ForecastRequest)
+)
+async def get_forecast(request: Request):
     """
     Generate spending forecast for the next N months.
     Uses historical transaction data to predict future spending patterns.
     """
-    result = calculate_forecast(request.transactions, request.forecast_months)
+    content = await run_in_threadpool(forecast_from_body, await request.body())
     
-    return ForecastResponse(
-        user_id=request.user_id,
-        forecasts=[MonthlyForecast(**f) for f in result["forecasts"]],
-        average_monthly_spending=result["average_monthly_spending"],
-        average_monthly_income=result["average_monthly_income"],
-        spending_trend=result["spending_trend"],
-        savings_rate=result["savings_rate"],
-        advice=result["advice"]
-    )
+    # The result already has the response shape; serialize it once, unvalidated
+    return ORJSONResponse(content=content)
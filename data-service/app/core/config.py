@@ -3,9 +3,15 @@ Configuration settings for the Data Service.
 """
 
 import os
-from typing import List
+from functools import cached_property
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 
 class Settings(BaseSettings):
     """Application settings."""
@@ -13,6 +19,7 @@ class Settings(BaseSettings):
     # Service configuration
     SERVICE_NAME: str = "smartspend-data-service"
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
+    ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     
     # CORS settings
     CORS_ORIGINS: List[str] = [
@@ -20,6 +27,8 @@ class Settings(BaseSettings):
         "http://localhost:8080",
         "http://backend:8080"
     ]
+    # Also accepted in production: SmartSpend domains and their subdomains
+    PRODUCTION_ORIGIN_REGEX: str = r"https://([a-z0-9-]+\.)*smartspend\.(local|com)"
     
     # Category keywords mapping
     CATEGORY_KEYWORDS: dict = {
@@ -80,6 +89,53 @@ class Settings(BaseSettings):
         ]
     }
     
+    @cached_property
+    def cors_origins_set(self) -> frozenset:
+        """``CORS_ORIGINS`` as a frozenset, for constant-time origin checks."""
+        return frozenset(self.CORS_ORIGINS)
+    
+    @property
+    def cors_origin_regex(self) -> Optional[str]:
+        """Origin pattern accepted in addition to ``CORS_ORIGINS``, in production only."""
+        return self.PRODUCTION_ORIGIN_REGEX if self.ENVIRONMENT == "production" else None
+    
+    @cached_property
+    def keyword_pairs(self) -> tuple:
+        """
+        Flat (lowercased keyword, category, keyword) triples, computed once.
+        
+        Triples follow configuration order, so matches collected from a
+        single pass over them are already ordered within each category.
+        """
+        return tuple(
+            (keyword.lower(), category, keyword)
+            for category, keywords in self.CATEGORY_KEYWORDS.items()
+            for keyword in keywords
+        )
+    
+    @cached_property
+    def keyword_automaton(self):
+        """
+        Aho-Corasick automaton over every lowercased category keyword.
+        
+        Each keyword maps to the (category, position, keyword) entries it
+        belongs to, where position indexes ``keyword_pairs``, so one scan
+        of a description reports every matching keyword across all
+        categories. None when pyahocorasick is not installed.
+        """
+        if ahocorasick is None:
+            return None
+        
+        entries = {}
+        for position, (word, category, keyword) in enumerate(self.keyword_pairs):
+            entries.setdefault(word, []).append((category, position, keyword))
+        
+        automaton = ahocorasick.Automaton()
+        for word, owners in entries.items():
+            automaton.add_word(word, tuple(owners))
+        automaton.make_automaton()
+        return automaton
+    
     class Config:
         env_file = ".env"
 
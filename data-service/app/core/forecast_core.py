@@ -0,0 +1,64 @@
+"""
+Numeric core of the spending forecast.
+Pure NumPy over the monthly totals; no request or response handling.
+"""
+
+import math
+
+import numpy as np
+
+
+def ols_1d(y: np.ndarray) -> tuple[float, float]:
+    """
+    Fit y = intercept + slope * x by least squares, with x = 0, 1, ..., n-1.
+    
+    Args:
+        y: Observed values, at least two
+        
+    Returns:
+        Tuple of (slope, intercept)
+    """
+    # Normal equations from raw sums. With x = 0..k-1, sum(x) and sum(x^2)
+    # have closed forms, so only sum(y) and sum(x * y) touch the data.
+    k = len(y)
+    sx = k * (k - 1) / 2
+    sxx = (k - 1) * k * (2 * k - 1) / 6
+    sy = float(y.sum())
+    sxy = float(np.arange(k, dtype=np.float64) @ y)
+    slope = (k * sxy - sx * sy) / (k * sxx - sx * sx)
+    return slope, (sy - slope * sx) / k
+
+
+def compute_forecast(monthly_spending: np.ndarray, monthly_income: np.ndarray,
+                     horizon: int) -> tuple:
+    """
+    Project monthly spending forward along its least-squares trend line.
+    
+    Predictions are clipped at zero, and the confidence band is 1.96
+    sample standard deviations of the observed monthly spending.
+    
+    Args:
+        monthly_spending: Observed monthly spending, at least two months
+        monthly_income: Observed monthly income, possibly empty
+        horizon: Number of months to forecast
+        
+    Returns:
+        Tuple of (predictions, lower, upper, slope, avg_spending, avg_income)
+    """
+    slope, intercept = ols_1d(monthly_spending)
+    
+    # Mean and sample standard deviation from one set of running sums
+    n = len(monthly_spending)
+    total = float(monthly_spending.sum())
+    total_sq = float(monthly_spending @ monthly_spending)
+    avg_spending = total / n
+    std_dev = math.sqrt(max(total_sq - total * avg_spending, 0.0) / (n - 1))
+    
+    # Predict every future month at once
+    future_x = np.arange(len(monthly_spending), len(monthly_spending) + horizon)
+    predictions = np.maximum(intercept + slope * future_x, 0)
+    lower = np.maximum(predictions - 1.96 * std_dev, 0)
+    upper = predictions + 1.96 * std_dev
+    
+    avg_income = float(monthly_income.mean()) if len(monthly_income) > 0 else 0
+    return predictions, lower, upper, slope, avg_spending, avg_income
@@ -2,20 +2,33 @@
 Shared utility functions for data processing.
 """
 
-from datetime import datetime
-from typing import List, Dict, Any
-import pandas as pd
+import math
+import re
+import orjson
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
+import numpy as np
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 from app.core.models import Transaction
 
 
-def parse_date(date_str: str) -> datetime:
+def parse_date(date_str: str, default: Optional[datetime] = None) -> datetime:
     """
     Parse a date string to datetime object.
     Handles ISO format with optional timezone.
     
     Args:
         date_str: Date string in ISO format
+        default: Value for malformed dates (defaults to the current time)
         
     Returns:
         datetime object
@@ -23,44 +36,346 @@ def parse_date(date_str: str) -> datetime:
     try:
         return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
     except (ValueError, AttributeError):
-        return datetime.now()
+        return default or datetime.now()
+
+
+def month_key(date: datetime) -> int:
+    """Encode a date's month as the integer year * 12 + (month - 1)."""
+    return date.year * 12 + date.month - 1
+
+
+# A complete ISO date or datetime that ``parse_date`` always accepts. Days
+# stop at 28 so the string cannot name an impossible date (e.g. Feb 30);
+# anything else, later days included, is parsed in full.
+ISO_DATETIME = re.compile(
+    r"(?!0000)\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|1\d|2[0-8])"
+    r"(?:[T ](?:[01]\d|2[0-3])(?::[0-5]\d(?::[0-5]\d(?:\.\d{6}|\.\d{3})?)?)?"
+    r"(?:Z|[+-](?:[01]\d|2[0-3]):[0-5]\d)?)?"
+)
 
+# month_key of the datetime64 epoch month, 1970-01
+_EPOCH_MONTH_KEY = 1970 * 12
 
-def transactions_to_dataframe(transactions: List[Transaction]) -> pd.DataFrame:
+
+def _month_prefix(date: datetime) -> str:
+    """Format a date's month as "YYYY-MM", zero-padding years below 1000."""
+    return f"{date.year:04d}-{date.month:02d}"
+
+
+def month_keys(dates: List[str], now: Optional[datetime] = None) -> np.ndarray:
     """
-    Convert a list of transactions to a pandas DataFrame.
+    Encode ISO date strings as ``month_key`` integers in one vectorized cast.
+    
+    Each date keeps its own calendar month, offset and all, as
+    ``parse_date`` reads it. Strings matching ``ISO_DATETIME`` are valid by
+    construction, so only their "YYYY-MM" prefix is read; every other row
+    goes through ``parse_date``, which maps malformed dates to the month
+    of ``now``.
+    
+    Args:
+        dates: ISO format date strings
+        now: Fallback time for malformed dates (defaults to the current time)
+        
+    Returns:
+        int32 array of ``month_key`` values
+    """
+    now = now or datetime.now()
+    prefixes = [
+        date[:7] if ISO_DATETIME.fullmatch(date) else _month_prefix(parse_date(date, now))
+        for date in dates
+    ]
+    months = np.array(prefixes, dtype='datetime64[M]').astype(np.int32)
+    return months + np.int32(_EPOCH_MONTH_KEY)
+
+
+def month_labels(keys: np.ndarray) -> List[str]:
+    """Format ``month_key`` integers as "YYYY-MM" labels."""
+    return [f"{key // 12:04d}-{key % 12 + 1:02d}" for key in keys.tolist()]
+
+
+def transactions_key(transactions: List[Transaction]) -> tuple:
+    """
+    Build a hashable snapshot of a transaction list.
+    
+    Used to key the conversion caches, so the same payload sent to
+    several endpoints is only parsed once.
     
     Args:
         transactions: List of Transaction objects
         
     Returns:
-        DataFrame with parsed dates and month column
+        Tuple of (id, description, amount, type, category, date) tuples
+    """
+    return tuple((t.id, t.description, t.amount, t.type, t.category, t.date) for t in transactions)
+
+
+def transactions_to_soa(transactions: List[Transaction]) -> Dict[str, np.ndarray]:
     """
-    if not transactions:
-        return pd.DataFrame(columns=['id', 'description', 'amount', 'type', 'category', 'date', 'month'])
+    Convert transactions to column arrays with fully parsed timestamps.
     
-    data = [{
-        "id": t.id,
-        "description": t.description,
-        "amount": float(t.amount),
-        "type": t.type,
-        "category": t.category or "Uncategorized",
-        "date": parse_date(t.date)
-    } for t in transactions]
+    Extends ``transactions_to_arrays`` with a ``date`` column of parsed
+    datetimes, offsets kept as given, and a ``timestamp`` sort key in
+    naive UTC. Malformed dates fall back to the current time. Results are
+    cached per distinct payload, so the arrays are read-only.
     
-    df = pd.DataFrame(data)
-    df['month'] = df['date'].dt.to_period('M')
-    return df
+    Args:
+        transactions: List of Transaction objects
+        
+    Returns:
+        Dict of equal-length arrays, including an object ``date`` and a
+        datetime64[us] ``timestamp``
+    """
+    return _soa_from_key(transactions_key(transactions))
+
+
+def _naive_utc(date: datetime) -> datetime:
+    """Convert a timezone-aware datetime to naive UTC; naive values pass through."""
+    if date.tzinfo is None:
+        return date
+    return date.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=32)
+def _soa_from_key(key: tuple) -> Dict[str, np.ndarray]:
+    """Build the column arrays plus parsed dates for a ``transactions_key`` snapshot."""
+    # One fallback time for the whole snapshot, so malformed dates tie
+    now = datetime.now()
+    parsed = [parse_date(row[5], now) for row in key]
+    dates = np.array(parsed, dtype=object)
+    # Aware dates are only normalized for ordering; the output keeps the offset
+    timestamps = np.array([_naive_utc(date) for date in parsed], dtype='datetime64[us]')
+    dates.setflags(write=False)
+    timestamps.setflags(write=False)
+    return {**_arrays_from_key(key), "date": dates, "timestamp": timestamps}
+
+
+def transactions_to_arrays(transactions: List[Transaction]) -> Dict[str, np.ndarray]:
+    """
+    Convert a list of transactions to parallel NumPy arrays.
+    
+    Results are cached per distinct payload, so the arrays are read-only.
+    
+    Args:
+        transactions: List of Transaction objects
+        
+    Returns:
+        Dict of equal-length arrays keyed by field name, with an int32
+        ``month_key`` array in place of the raw date, a ``category_idx``
+        array indexing the payload's sorted ``category_names``, and the
+        stable ``month_order`` permutation that sorts rows by month
+    """
+    return _arrays_from_key(transactions_key(transactions))
+
+
+@lru_cache(maxsize=32)
+def _arrays_from_key(key: tuple) -> Dict[str, np.ndarray]:
+    """Build the column arrays for a ``transactions_key`` snapshot."""
+    ids, descriptions, amounts, types, categories, dates = zip(*key) if key else ((),) * 6
+    n = len(key)
+    category_column = np.array([category or "Uncategorized" for category in categories], dtype=object)
+    # Categories are numbered per payload, in name order
+    category_names, category_idx = np.unique(category_column, return_inverse=True)
+    arrays = {
+        # Object, not int64: ids are unbounded Python ints
+        "id": np.array(ids, dtype=object),
+        "description": np.array(descriptions, dtype=object),
+        "amount": np.fromiter(amounts, dtype=np.float64, count=n),
+        "type": np.array(types, dtype=object),
+        "category": category_column,
+        "category_idx": category_idx.reshape(-1),
+        "category_names": category_names,
+        "month": month_keys(dates)
+    }
+    # Sorted here, once per payload, so endpoints can group by month in linear time
+    arrays["month_order"] = np.argsort(arrays["month"], kind='stable')
+    for values in arrays.values():
+        values.setflags(write=False)
+    return arrays
+
+
+def transaction_rows_to_arrays(rows: Any) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Convert decoded JSON transaction rows straight to column arrays.
+    
+    Skips building a Transaction model per row. Only rows whose fields
+    already have exactly the model's types are accepted, so the result
+    (and its cache entry) matches ``transactions_to_arrays``.
+    
+    Args:
+        rows: The decoded ``transactions`` value of a request body
+        
+    Returns:
+        Same arrays as ``transactions_to_arrays``, or None if any row needs
+        coercion or fails validation, so callers can fall back to pydantic
+    """
+    if not isinstance(rows, list):
+        return None
+    
+    key = []
+    try:
+        for row in rows:
+            id_, description, amount = row['id'], row['description'], row['amount']
+            type_, category, date = row['type'], row.get('category'), row['date']
+            if not (
+                type(id_) is int and type(amount) in (float, int)
+                and type(description) is str and type(type_) is str and type(date) is str
+                and (category is None or type(category) is str)
+            ):
+                return None
+            key.append((id_, description, float(amount), type_, category, date))
+    except (KeyError, TypeError, AttributeError):
+        return None
+    return _arrays_from_key(tuple(key))
+
+
+def decode_transactions_request(body: bytes, int_fields: Dict[str, Optional[int]]) -> Optional[tuple]:
+    """
+    Decode a well-formed transactions request with orjson, without pydantic.
+    
+    The fast path for request bodies: ``transactions`` goes straight to
+    column arrays via ``transaction_rows_to_arrays``, so no per-row model
+    is ever built. Anything unusual is left to full validation.
+    
+    Args:
+        body: Raw request body
+        int_fields: Top-level integer fields to read, mapped to their
+            default (None for required fields)
+        
+    Returns:
+        Tuple of (dict of int_fields values, arrays), or None when the body
+        needs full validation (malformed, coerced or invalid values)
+    """
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    
+    values = {name: payload.get(name, default) for name, default in int_fields.items()}
+    if any(type(value) is not int for value in values.values()):
+        return None
+    
+    data = transaction_rows_to_arrays(payload.get('transactions'))
+    return None if data is None else (values, data)
+
+
+def month_groups(data: Dict[str, np.ndarray]) -> tuple:
+    """
+    Distinct months and each row's month group, from the cached month order.
+    
+    Same result as ``np.unique(data['month'], return_inverse=True)``, but
+    the sort already happened once per payload, so this is linear.
+    
+    Args:
+        data: Column arrays from ``transactions_to_arrays``
+        
+    Returns:
+        Tuple of (sorted distinct month keys, int64 group index per row)
+    """
+    order = data['month_order']
+    sorted_months = data['month'][order]
+    group_idx = np.empty(order.size, dtype=np.int64)
+    if order.size == 0:
+        return sorted_months, group_idx
+    
+    # A new group starts wherever the sorted month changes
+    starts = np.empty(order.size, dtype=bool)
+    starts[0] = True
+    np.not_equal(sorted_months[1:], sorted_months[:-1], out=starts[1:])
+    group_idx[order] = np.cumsum(starts) - 1
+    return sorted_months[starts], group_idx
+
+
+def _group_sum_count_loop(group_ids: np.ndarray, values: np.ndarray, n_groups: int):
+    """Accumulate per-group sums and counts in a single pass (compiled by Numba)."""
+    sums = np.zeros(n_groups, dtype=np.float64)
+    counts = np.zeros(n_groups, dtype=np.int64)
+    for i in range(group_ids.shape[0]):
+        group = group_ids[i]
+        sums[group] += values[i]
+        counts[group] += 1
+    return sums, counts
+
+
+def _group_sum_count_numpy(group_ids: np.ndarray, values: np.ndarray, n_groups: int):
+    """Per-group sums and counts with two bincount passes."""
+    return (
+        np.bincount(group_ids, weights=values, minlength=n_groups),
+        np.bincount(group_ids, minlength=n_groups)
+    )
+
+
+if njit is not None:
+    _group_sum_count = njit(cache=True)(_group_sum_count_loop)
+    # Compile at import, for writable and read-only (cached) inputs alike,
+    # so the first request does not pay the JIT cost
+    _warm_ids = np.zeros(1, dtype=np.int64)
+    _warm_values = np.zeros(1, dtype=np.float64)
+    _group_sum_count(_warm_ids, _warm_values, 1)
+    _warm_values.setflags(write=False)
+    _group_sum_count(_warm_ids, _warm_values, 1)
+else:
+    _group_sum_count = _group_sum_count_numpy
+
+
+def group_sum_count(group_ids: np.ndarray, values: np.ndarray, n_groups: int) -> tuple:
+    """
+    Sum and count values per group id.
+    
+    Args:
+        group_ids: Integer group id per value, in [0, n_groups)
+        values: Values to sum
+        n_groups: Number of groups
+        
+    Returns:
+        Tuple of (sums, counts) arrays of length n_groups
+    """
+    return _group_sum_count(group_ids.astype(np.int64, copy=False), values, n_groups)
+
+
+# Relative nudge applied to half-cent ties. ``value * scale`` lands within
+# a couple of ulps of the written tie (1.005 * 100 == 100.49999999999999),
+# so a few ulps of slack rounds ties as written.
+_TIE_EPSILON = 2.0 ** -50
 
 
 def round_currency(value: float, decimals: int = 2) -> float:
-    """Round a currency value to specified decimal places."""
-    return round(float(value), decimals)
+    """
+    Round a currency value to specified decimal places.
+    
+    Works in integer cents, rounding half-cents away from zero as the value
+    is written (1.005 -> 1.01), not by its exact binary value.
+    Non-finite values are returned unchanged.
+    """
+    scale = 10 ** decimals
+    scaled = float(value) * scale
+    if not math.isfinite(scaled):
+        return float(value)
+    return int(scaled + math.copysign(0.5 + abs(scaled) * _TIE_EPSILON, scaled)) / scale
+
+
+def round_currency_array(values: np.ndarray, decimals: int = 2) -> np.ndarray:
+    """
+    Vectorized ``round_currency``, with identical results.
+    
+    Args:
+        values: Currency values
+        decimals: Decimal places to keep
+        
+    Returns:
+        float64 array of rounded values
+    """
+    scale = 10 ** decimals
+    scaled = np.asarray(values, dtype=np.float64) * scale
+    half = np.copysign(0.5 + np.abs(scaled) * _TIE_EPSILON, scaled)
+    # Adding 0.0 turns the -0.0 of small negatives into 0.0, like int() does
+    return np.trunc(scaled + half) / scale + 0.0
 
 
 def calculate_percentage(part: float, total: float) -> float:
-    """Calculate percentage with zero-division protection."""
-    return round(part / total * 100, 2) if total > 0 else 0.0
+    """Calculate percentage with zero-division protection, rounded like currency."""
+    return round_currency(part / total * 100) if total > 0 else 0.0
 
 
 def get_empty_analysis_result() -> Dict[str, Any]:
@@ -76,3 +391,74 @@ def get_empty_analysis_result() -> Dict[str, Any]:
         "unusual_transactions": [],
         "insights": ["Add transactions to get spending insights."]
     }
+
+
+def request_body_schema(model: type) -> Dict[str, Any]:
+    """
+    Build an ``openapi_extra`` request body for routes that parse JSON themselves.
+    
+    Nested ``$defs`` references are inlined so the schema is self-contained.
+    
+    Args:
+        model: Pydantic model describing the request body
+        
+    Returns:
+        Dict suitable for the ``openapi_extra`` route argument
+    """
+    schema = model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+    
+    def resolve(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(definitions[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+    
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": resolve(schema)}}
+        }
+    }
+
+
+async def validate_request_body(request: Request, adapter: TypeAdapter) -> Any:
+    """
+    Validate a raw JSON request body in one pass through pydantic-core.
+    
+    Args:
+        request: Incoming HTTP request
+        adapter: TypeAdapter for the expected body type
+        
+    Returns:
+        The validated body
+        
+    Raises:
+        RequestValidationError: If the body is malformed or fails validation
+    """
+    return validate_json_body(await request.body(), adapter)
+
+
+def validate_json_body(body: bytes, adapter: TypeAdapter) -> Any:
+    """
+    Synchronous form of ``validate_request_body`` for an already-read body.
+    
+    Args:
+        body: Raw JSON request body
+        adapter: TypeAdapter for the expected body type
+        
+    Returns:
+        The validated body
+        
+    Raises:
+        RequestValidationError: If the body is malformed or fails validation
+    """
+    try:
+        return adapter.validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)
+        ])
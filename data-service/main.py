@@ -6,6 +6,7 @@ FastAPI microservice for transaction categorization, spending analysis, and fore
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
 from app.api import categorize, forecast, analyze
@@ -26,13 +27,15 @@ app = FastAPI(
     title="SmartSpend Data Service",
     description="Data processing and analytics microservice for SmartSpend",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
+    allow_origins=settings.cors_origins_set,
+    allow_origin_regex=settings.cors_origin_regex,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -0,0 +1,57 @@
+"""
+Category analysis endpoint.
+"""
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+client = TestClient(app)
+
+
+def _transactions(dates):
+    return [
+        {"id": i, "description": f"t{i}", "amount": 10.0 + i, "type": "EXPENSE",
+         "category": "Food", "date": date}
+        for i, date in enumerate(dates)
+    ]
+
+
+def test_recent_transactions_echo_dates_with_their_offset():
+    dates = ["2024-04-21T17:30:00+02:00", "2024-04-21T18:00:00+02:00", "2024-01-31T23:30:00+02:00"]
+    response = client.post("/api/analyze/category/Food", json={"user_id": 1, "transactions": _transactions(dates)})
+
+    assert response.status_code == 200
+    assert [t["date"] for t in response.json()["recent_transactions"]] == [
+        "2024-04-21 18:00:00+02:00",
+        "2024-04-21 17:30:00+02:00",
+        "2024-01-31 23:30:00+02:00",
+    ]
+
+
+def test_recent_transactions_order_by_instant_across_offsets():
+    dates = ["2024-04-21T18:00:00+02:00", "2024-04-21T17:30:00Z"]
+    response = client.post("/api/analyze/category/Food", json={"user_id": 1, "transactions": _transactions(dates)})
+
+    # 17:30Z is later than 18:00+02:00 (16:00Z)
+    assert [t["date"] for t in response.json()["recent_transactions"]] == [
+        "2024-04-21 17:30:00+00:00",
+        "2024-04-21 18:00:00+02:00",
+    ]
+
+
+def test_recent_transactions_keep_naive_dates_naive():
+    dates = ["2024-04-21", "2024-04-22T10:11:12.123456"]
+    response = client.post("/api/analyze/category/Food", json={"user_id": 1, "transactions": _transactions(dates)})
+
+    assert [t["date"] for t in response.json()["recent_transactions"]] == [
+        "2024-04-22 10:11:12.123456",
+        "2024-04-21 00:00:00",
+    ]
+
+
+def test_unknown_category_is_not_found():
+    response = client.post("/api/analyze/category/Travel", json={"user_id": 1, "transactions": _transactions(["2024-04-21"])})
+
+    assert response.status_code == 404
@@ -0,0 +1,103 @@
+"""
+Keyword categorization, checked against the original substring matcher.
+"""
+
+import random
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import categorize
+from app.core.config import settings
+from main import app
+
+
+def baseline_categorize(description):
+    """The original per-keyword regex/substring matcher."""
+    description_lower = description.lower()
+
+    best_category = "Uncategorized"
+    best_score = 0
+    matched_keywords = []
+
+    for category, keywords in settings.CATEGORY_KEYWORDS.items():
+        matches = []
+        for keyword in keywords:
+            pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
+            if re.search(pattern, description_lower) or keyword.lower() in description_lower:
+                matches.append(keyword)
+
+        if len(matches) > best_score:
+            best_score = len(matches)
+            best_category = category
+            matched_keywords = matches
+
+    confidence = {0: 0.0, 1: 0.7, 2: 0.85}.get(best_score, 0.95)
+    return best_category, confidence, matched_keywords
+
+
+KEYWORDS = [keyword for keywords in settings.CATEGORY_KEYWORDS.values() for keyword in keywords]
+
+FIXED = [
+    "",
+    "Payment",
+    "STARBUCKS COFFEE #123",
+    "Uber Eats restaurant delivery",
+    "uberuber taxi",
+    "Targeted ad refund",
+    "gasoline at the Shell station",
+    "AMAZON PRIME VIDEO subscription",
+    "walmart supermarket grocery",
+    "İstanbul cafe",
+    "café Ωmega",
+    "Netflix\0Spotify",
+]
+
+
+def random_descriptions(seed, count):
+    rng = random.Random(seed)
+    filler = ["payment", "inc", "#4411", "co", "store", "online", "-", "ref", "x"]
+    descriptions = []
+    for _ in range(count):
+        words = rng.sample(KEYWORDS, rng.randint(0, 4)) + rng.sample(filler, rng.randint(0, 3))
+        rng.shuffle(words)
+        text = rng.choice([" ", "", "*"]).join(words)
+        descriptions.append(rng.choice([str.upper, str.lower, str.title, str])(text))
+    return descriptions
+
+
+DESCRIPTIONS = FIXED + random_descriptions(0, 500)
+
+
+@pytest.fixture(params=["automaton", "substring"])
+def matcher(request, monkeypatch):
+    if request.param == "automaton":
+        if categorize.KEYWORD_AUTOMATON is None:
+            pytest.skip("pyahocorasick is not installed")
+    else:
+        monkeypatch.setattr(categorize, "KEYWORD_AUTOMATON", None)
+    return request.param
+
+
+def test_single_descriptions_match_the_original(matcher):
+    for description in DESCRIPTIONS:
+        assert categorize.categorize_transaction(description) == baseline_categorize(description), description
+
+
+def test_batch_matches_the_original(matcher):
+    assert categorize.categorize_transactions(DESCRIPTIONS) == [baseline_categorize(d) for d in DESCRIPTIONS]
+
+
+def test_batch_endpoint_matches_single_endpoint():
+    client = TestClient(app)
+    # The single endpoint rejects blank descriptions
+    descriptions = [d for d in FIXED + random_descriptions(1, 50) if d.strip()]
+
+    batch = client.post("/api/categorize/batch", json=descriptions).json()["results"]
+
+    for description, result in zip(descriptions, batch):
+        single = client.post("/api/categorize", json={"description": description}).json()
+        assert result["category"] == single["category"]
+        assert result["confidence"] == single["confidence"]
+        assert result["matched_keywords"] == single["matched_keywords"]
@@ -0,0 +1,91 @@
+"""
+Forecast request hash and result cache.
+"""
+
+import pytest
+
+from app.api import forecast
+from app.api.forecast import cached_forecast, forecast_request_hash
+from app.core.models import Transaction
+from app.core.utils import transactions_to_arrays
+
+
+ROWS = [
+    (1, "Rent", 1200.0, "EXPENSE", "Housing", "2024-01-01"),
+    (2, "Salary", 4000.0, "INCOME", "Salary", "2024-01-15"),
+    (3, "Groceries", 310.5, "EXPENSE", "Food", "2024-02-03"),
+    (4, "Salary", 4000.0, "INCOME", "Salary", "2024-02-15"),
+    (5, "Fuel", 80.25, "EXPENSE", "Transport", "2024-03-09"),
+]
+
+
+def arrays(rows):
+    return transactions_to_arrays([
+        Transaction(id=id, description=description, amount=amount, type=type, category=category, date=date)
+        for id, description, amount, type, category, date in rows
+    ])
+
+
+def replace(index, **changes):
+    fields = ["id", "description", "amount", "type", "category", "date"]
+    rows = list(ROWS)
+    row = dict(zip(fields, rows[index]))
+    row.update(changes)
+    rows[index] = tuple(row[field] for field in fields)
+    return rows
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(forecast, "_FORECAST_CACHE", type(forecast._FORECAST_CACHE)())
+
+
+def test_hash_is_stable_for_the_same_data():
+    assert forecast_request_hash(arrays(ROWS), 6) == forecast_request_hash(arrays(list(ROWS)), 6)
+
+
+@pytest.mark.parametrize("changes", [
+    {"amount": 310.51},
+    {"type": "INCOME"},
+    {"date": "2024-03-03"},
+])
+def test_hash_changes_with_amount_type_and_month(changes):
+    assert forecast_request_hash(arrays(replace(2, **changes)), 6) != forecast_request_hash(arrays(ROWS), 6)
+
+
+def test_hash_changes_with_the_horizon():
+    assert forecast_request_hash(arrays(ROWS), 3) != forecast_request_hash(arrays(ROWS), 6)
+
+
+@pytest.mark.parametrize("changes", [
+    {"id": 99},
+    {"description": "Supermarket"},
+    {"category": "Shopping"},
+    {"date": "2024-02-28T18:45:00"},
+])
+def test_hash_ignores_fields_the_forecast_does_not_use(changes):
+    assert forecast_request_hash(arrays(replace(2, **changes)), 6) == forecast_request_hash(arrays(ROWS), 6)
+
+
+def test_repeated_requests_reuse_the_cached_result(monkeypatch):
+    calls = []
+    compute = forecast.forecast_from_arrays
+    monkeypatch.setattr(forecast, "forecast_from_arrays", lambda data, months: calls.append(months) or compute(data, months))
+
+    first = cached_forecast(arrays(ROWS), 6)
+    again = cached_forecast(arrays(replace(2, description="Supermarket")), 6)
+    other = cached_forecast(arrays(ROWS), 3)
+
+    assert again is first
+    assert other is not first
+    assert calls == [6, 3]
+
+
+def test_cache_keeps_only_the_most_recent_requests(monkeypatch):
+    monkeypatch.setattr(forecast, "FORECAST_CACHE_SIZE", 2)
+    data = arrays(ROWS)
+
+    for months in (1, 2, 1, 3):
+        cached_forecast(data, months)
+
+    assert list(forecast._FORECAST_CACHE) == [forecast_request_hash(data, 1), forecast_request_hash(data, 3)]
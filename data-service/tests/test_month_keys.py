@@ -0,0 +1,63 @@
+"""
+Month bucketing of transaction dates.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.core.utils import month_keys, month_labels, transactions_to_soa
+from app.core.models import Transaction
+
+
+NOW = datetime(2026, 10, 14, 12, 0)
+
+
+def labels(dates):
+    return month_labels(month_keys(dates, NOW))
+
+
+@pytest.mark.parametrize("date", [
+    "2024-01-99garbage",
+    "2024-02-30",
+    "2023-02-29",
+    "2024-13-01",
+    "2024-03",
+    "2024-03-15T25:00:00",
+    "garbage",
+    "",
+])
+def test_malformed_dates_fall_back_to_the_current_month(date):
+    assert labels([date]) == ["2026-10"]
+
+
+@pytest.mark.parametrize("date, month", [
+    ("2024-02-29", "2024-02"),
+    ("2024-01-31", "2024-01"),
+    ("2024-03-15T10", "2024-03"),
+    ("2024-03-15 10:00:00Z", "2024-03"),
+    ("2024-03-15T10:00:00.1234", "2024-03"),
+    ("20240315", "2024-03"),
+    ("0999-12-31", "0999-12"),
+])
+def test_valid_dates_keep_their_month(date, month):
+    assert labels([date]) == [month]
+
+
+@pytest.mark.parametrize("date, month", [
+    ("2024-02-01T00:30:00+02:00", "2024-02"),
+    ("2024-01-31T23:30:00-05:00", "2024-01"),
+    ("2024-01-31T23:30:00-0500", "2024-01"),
+])
+def test_offset_dates_use_their_own_calendar_month(date, month):
+    assert labels([date]) == [month]
+
+
+def test_month_matches_the_parsed_date_column():
+    dates = ["2024-02-01T00:30:00+02:00", "2024-01-31T23:30:00-05:00", "2024-02-29T23:59:59+14:00"]
+    data = transactions_to_soa([
+        Transaction(id=i, description="t", amount=1.0, type="EXPENSE", date=date)
+        for i, date in enumerate(dates)
+    ])
+
+    assert month_labels(data['month']) == [f"{d.year:04d}-{d.month:02d}" for d in data['date']]
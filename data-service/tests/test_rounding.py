@@ -0,0 +1,67 @@
+"""
+Currency and percentage rounding.
+"""
+
+import math
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+import pytest
+
+from app.core.utils import calculate_percentage, round_currency, round_currency_array
+
+
+def half_up(value):
+    """Reference: round the value as written, half-cents away from zero."""
+    return float(Decimal(repr(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+
+HALF_CENTS = [0.005, 0.015, 0.125, 0.285, 1.005, 1.115, 2.675, 4.355, 10.075, 1234567.895]
+
+
+@pytest.mark.parametrize("value", HALF_CENTS + [-v for v in HALF_CENTS])
+def test_half_cents_round_away_from_zero_as_written(value):
+    assert round_currency(value) == half_up(value)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (1.004, 1.0),
+    (1.0049999, 1.0),
+    (2.67, 2.67),
+    (0.0, 0.0),
+    (397.245, 397.25),
+])
+def test_non_ties_round_to_nearest(value, expected):
+    assert round_currency(value) == expected
+
+
+def test_small_negatives_round_to_positive_zero():
+    assert math.copysign(1.0, round_currency(-0.004)) == 1.0
+    assert math.copysign(1.0, round_currency_array(np.array([-0.004]))[0]) == 1.0
+
+
+def test_non_finite_values_pass_through():
+    assert round_currency(math.inf) == math.inf
+    assert math.isnan(round_currency(math.nan))
+
+
+def test_array_version_matches_scalar():
+    rng = np.random.default_rng(0)
+    values = np.concatenate([
+        rng.integers(-10 ** 8, 10 ** 8, 20000) / 1000,
+        rng.uniform(-1e6, 1e6, 20000),
+        np.array(HALF_CENTS),
+    ])
+
+    assert round_currency_array(values).tolist() == [round_currency(v) for v in values.tolist()]
+
+
+def test_summed_cents_round_as_written():
+    # Average of two-decimal amounts landing exactly on a half cent
+    assert round_currency((397.24 + 397.25) / 2) == 397.25
+
+
+def test_percentages_round_like_currency():
+    assert calculate_percentage(1.005, 100) == 1.01
+    assert calculate_percentage(1, 3) == 33.33
+    assert calculate_percentage(5, 0) == 0.0